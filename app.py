@@ -1,22 +1,28 @@
-import shutil
+# Imported first so the startup timeline covers loading everything else
+from startupTimeline import startup_timeline
 import re
 import os
-import toml
 import sys
-import subprocess
-import json
 #from collections import defaultdict
 from pathlib import Path
-from PyQt6.QtGui import QAction, QColor, QIcon
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtWidgets import QApplication, QLabel, QListWidget, QListWidgetItem, QSplitter, QToolBar, QMessageBox, QInputDialog, QMenu, QTableWidget, QTableWidgetItem, QApplication, QMainWindow, QWidget, QCheckBox, QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QFileDialog
-from datetime import datetime
-from functools import partial
-from fileViewer import DirTreeView
-from dllOrganizer import dllOrganizer
-
-# path to TOML config file that contains path to config_eldenring.toml
-config_path = 'config.toml'
+from PyQt6.QtGui import QAction, QIcon, QKeySequence
+from PyQt6.QtCore import Qt, QTimer, QObject, QEvent, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QLabel, QListWidget, QListWidgetItem, QSplitter, QToolBar, QMessageBox, QInputDialog, QMenu, QApplication, QMainWindow, QWidget, QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QFileDialog, QDockWidget, QPlainTextEdit
+from modWatcher import ModWatcher
+from scanWorker import Scanner, Jobs
+from conflictIndex import ConflictIndex
+from modTable import ModTableView
+from itemCatalog import get_catalog
+from configStore import config_store
+from gameLauncher import GameLauncher, config_snapshot
+from modTrash import trash_path, move_to_trash, restore, purge
+from modImport import ImportPlan, extract, archive_filter
+from modCore import (config_path, game_folders, build_conflict_index, mod_load_order, game_id, read_mod_folder_path,
+					 read_mod_folders, read_mods, apply_mod_states)
+from sessionCache import load_rows, save_rows
+from perfPanel import PerformancePanel
+from perfTrace import tracer
+startup_timeline.mark('imports')
 
 # Function to create a default TOML config file if it doesn't exist
 def create_default_toml_file(config_path):
@@ -26,34 +32,43 @@ def create_default_toml_file(config_path):
 	with open(config_path, 'w') as file:
 		# toml.dump(default_config, file)
 		pass
-	print(f"Created a default TOML file at {config_path}")
+	tracer.info(f"Created a default TOML file at {config_path}")
+
+# Seconds a deleted mod stays in the trash, and can be restored, before its
+# files are removed
+trash_delay = 60
 
 config_game_path = ''
-# Load and parse TOML config file
-try:
-	config = toml.load(config_path)
-	current_game = config['current_game']
-	# Check if current_game is empty or doesn't match any game names
-	if not current_game or current_game not in config:
-		# Select the path of the first game found
-		for game in config:
-			if game != 'current_game' and 'path' in config[game]:
-				current_game = game
-				config_game_path = config[game]['path']
-				# Update the current_game in the config dictionary
-				config['current_game'] = current_game
-				# Write the updated config back to the TOML file
-				with open(config_path, 'w', encoding='utf-8') as toml_file:
-					toml.dump(config, toml_file)
-				break
-	else:
-		config_game_path = config[current_game]['path']
-	if not os.path.exists(config_game_path):
-		raise FileNotFoundError(f"File not found: {config_game_path}")
-except Exception as e:
-	print(f"{e} creating one...")
-	create_default_toml_file(config_path)
-	#config = {'path': ''}  # Use default config after creating the file
+current_game = ''
+# Built once the main window has painted
+dll_pane = None
+
+def load_game_config():
+	global config_game_path, current_game
+	# Load and parse TOML config file
+	try:
+		config = config_store.load(config_path)
+		current_game = config['current_game']
+		# Check if current_game is empty or doesn't match any game names
+		if not current_game or current_game not in config:
+			# Select the path of the first game found
+			for game in config:
+				if game != 'current_game' and 'path' in config[game]:
+					current_game = game
+					config_game_path = config[game]['path']
+					# Update the current_game in the config dictionary
+					config['current_game'] = current_game
+					# Write the updated config back to the TOML file
+					config_store.commit(config_path)
+					break
+		else:
+			config_game_path = config[current_game]['path']
+		if not os.path.exists(config_game_path):
+			raise FileNotFoundError(f"File not found: {config_game_path}")
+	except Exception as e:
+		tracer.warning(f"{e} creating one...")
+		create_default_toml_file(config_path)
+		#config = {'path': ''}  # Use default config after creating the file
 
 # If the path is empty, prompt the user to select the path to 'config_eldenring.toml'
 
@@ -101,8 +116,6 @@ class PathInputDialog(QDialog):
 		path = self.pathLineEdit.text()
 		pattern = r'config_[a-zA-Z0-9]+\.toml'
 		if os.path.isfile(path) and re.match(pattern, os.path.basename(path)):
-			global config_game_path
-			config_game_path = path
 			self.nextButton.setEnabled(True)
 			self.pathValidated.emit(True)
 		else:
@@ -226,7 +239,7 @@ class SwitchGameDialog(QDialog):
 		self.setLayout(layout)
 
 	def populateGamesList(self):
-		self.config = toml.load(config_path)
+		self.config = config_store.load(config_path)
 		self.gamesListWidget.clear()
 		for game in self.config:
 			if game != 'current_game':
@@ -248,13 +261,13 @@ class SwitchGameDialog(QDialog):
 		if dialog.exec() == QDialog.DialogCode.Accepted:
 			game_name = dialog.GameNameLineEdit.text()
 			selected_path = dialog.pathLineEdit.text()
-			print(f"Selected Path: {selected_path}")
+			tracer.debug(f"Selected Path: {selected_path}")
 
 			# Load the existing config, update the path, and write it back to the file
 			try:
-				config_data = toml.load('config.toml')
+				config_data = config_store.load(config_path)
 			except Exception as e:
-				print(f"Failed to load 'config.toml': {e}")
+				tracer.warning(f"Failed to load 'config.toml': {e}")
 				config_data = {}  # Create an empty config if loading fails
 
 			# Ensure the game_name key exists in the config_data dictionary
@@ -265,25 +278,19 @@ class SwitchGameDialog(QDialog):
 			config_data[game_name]['path'] = selected_path
 
 			# Write the updated config back to 'config.toml'
-			with open('config.toml', 'w', encoding='utf-8') as config_file:
-				toml.dump(config_data, config_file)
+			config_store.set(config_path, config_data)
 			
 			self.populateGamesList()
 
 	def switchGame(self):
 		selected_game = self.gamesListWidget.currentItem().text()
-		self.config['current_game'] = selected_game
-		with open('config.toml', 'w', encoding='utf-8') as toml_file:
-			toml.dump(self.config, toml_file)
-		# Restart the application
-		QApplication.quit()
-		subprocess.Popen([sys.executable, __file__])
+		if switch_game(selected_game):
+			self.accept()
 
 	def removeGame(self):
 		selected_game = self.gamesListWidget.currentItem().text()
 		del self.config[selected_game]
-		with open('config.toml', 'w', encoding='utf-8') as toml_file:
-			toml.dump(self.config, toml_file)
+		config_store.commit(config_path)
 		self.populateGamesList()
 
 	def renameGame(self):
@@ -296,8 +303,8 @@ class SwitchGameDialog(QDialog):
 			selected_game = self.gamesListWidget.currentItem().text()
 			self.config[new_name] = self.config[selected_game]
 			del self.config[selected_game]
-			with open('config.toml', 'w', encoding='utf-8') as toml_file:
-				toml.dump(self.config, toml_file)
+			rename_game(selected_game, new_name)
+			config_store.commit(config_path)
 			self.populateGamesList()
 
 	def changeConfigPath(self):
@@ -306,101 +313,200 @@ class SwitchGameDialog(QDialog):
 			new_path = dialog.pathLineEdit.text()
 			selected_game = self.gamesListWidget.currentItem().text()
 			self.config[selected_game]['path'] = new_path
-			with open('config.toml', 'w', encoding='utf-8') as toml_file:
-				toml.dump(self.config, toml_file)
+			config_store.commit(config_path)
 			self.showGameDetails(self.gamesListWidget.currentItem())
+			if selected_game == current_game:
+				# Reload the current game from its new config
+				switch_game(selected_game)
+
+# Key: game name, Value: what was on screen for it when we switched away,
+# so switching back paints from memory while a rescan catches up. Parsed
+# configs stay in config_store and folder listings in file_index.
+game_sessions = {}
+
+def save_game_session():
+	save_session_cache()
+	game_sessions[current_game] = {
+		'config_game_path': config_game_path,
+		'root_mods_path': root_mods_path,
+		'folders': folders,
+		'mods': mods,
+		'conflict_index': conflict_index,
+		'dll_pane': dll_pane,
+	}
+
+def rename_game(old_name, new_name):
+	# The DLL panes write to config[game], so they follow the rename too.
+	# The caller commits config.toml.
+	global current_game
+	session = game_sessions.pop(old_name, None)
+	if session is not None:
+		game_sessions[new_name] = session
+		if session['dll_pane'] is not None:
+			session['dll_pane'].list_widget.current_game = new_name
+	if old_name == current_game:
+		current_game = new_name
+		config_store.load(config_path)['current_game'] = new_name
+		if dll_pane is not None:
+			dll_pane.list_widget.current_game = new_name
+
+def switch_game(game):
+	# Rebinds the window to another game without restarting the app
+	global current_game, config_game_path, root_mods_path, folders, mods, dll_pane
+	global conflict_index, conflicts, duplicates
+	config_data = config_store.load(config_path)
+	path = config_data.get(game, {}).get('path', '')
+	if not os.path.isfile(path):
+		QMessageBox.warning(None, 'Switch Game', f"Config file not found: {path}")
+		return False
+	if game == current_game and path == config_game_path:
+		return True
+	# Results of scans for the old game must not land in the new table
+	for scanner in (library_scanner, conflict_scanner, folder_scanner):
+		scanner.cancel()
+	save_game_session()
+	config_data['current_game'] = game
+	config_store.commit(config_path)
+	current_game = game
+	config_game_path = path
+
+	if splitter.count() > 1:
+		tree = splitter.widget(1)
+		tree.hide()
+		tree.deleteLater()
+	hashDuplicatesAction.blockSignals(True)
+	hashDuplicatesAction.setChecked(read_hash_duplicates())
+	hashDuplicatesAction.blockSignals(False)
+
+	mod_model.set_rows([])
+	session = game_sessions.get(game)
+	if session is not None and session['config_game_path'] == path:
+		populate_table((session['root_mods_path'], session['folders'], session['mods'], session['conflict_index']))
+		new_pane = session['dll_pane']
+		if new_pane is None:
+			new_pane = create_dll_pane()
+		else:
+			new_pane.list_widget.rescan()
+	else:
+		root_mods_path = read_mod_folder_path(config_game_path)
+		folders = []
+		mods = read_mods(config_game_path)
+		conflict_index = ConflictIndex({})
+		conflicts = {}
+		duplicates = {}
+		paint_cached_rows()
+		new_pane = create_dll_pane()
+	if dll_pane is None:
+		parent_splitter.addWidget(new_pane)
+	elif new_pane is not dll_pane:
+		parent_splitter.replaceWidget(1, new_pane)
+	dll_pane = new_pane
+	refresh_ui()
+	return True
 
 def runBat():
 	parent_dir = Path(config_game_path).parent
 	batch_file_name = 'launchmod' + os.path.basename(config_game_path)[6:-5] + '.bat'
-	print(batch_file_name)
 	batch_file_path = parent_dir / batch_file_name
-	subprocess.run(f'"{batch_file_path}"', shell=True, cwd=parent_dir)
-
-def conflictDetector(config_game_path, disabled_mods):
-	file_paths = {}  # Key: file name, Value: list of paths
-	conflicts = {}
-	# Convert list to set for faster lookup
-	disabled_mods_set = set(disabled_mods)
-# Extract the directory of the config_game_path
-	directory = os.path.dirname(config_game_path)
-
-	# Construct the path to the 'mod' folder
-	mod_folder_path = os.path.join(directory, 'mod')
-
-	# Walk through the directory
-	for root, dirs, files in os.walk(mod_folder_path):
-		if any(disabled_mod in root for disabled_mod in disabled_mods_set):
-			continue
-		for file in files:
-			rel_dir = os.path.relpath(root, mod_folder_path)
-			rel_file_path = os.path.join(rel_dir, file)
-			if file in file_paths:
-				file_paths[file].append(rel_file_path)
-			else:
-				file_paths[file] = [rel_file_path]
-
-	# Identify duplicates
-	duplicates = {file: paths for file,
-				  paths in file_paths.items() if len(paths) > 1}
-
-	# Store duplicates in the conflicts dictionary
-	for paths in duplicates.values():
-		for path in paths:
-			level_1_folder = path.split(os.sep)[0]
-			if level_1_folder in conflicts:
-				conflicts[level_1_folder].append(path)
-			else:
-				conflicts[level_1_folder] = [path]
-
-	return conflicts
-
+	if game_launcher.running():
+		window.statusBar().showMessage('The game is already running', 5000)
+		return
+	# The launcher reads the configs straight away, write pending edits first
+	config_store.flush()
+	snapshot = config_snapshot(config_store.load(config_game_path))
+	launch_log.clear()
+	launch_log.appendPlainText(f"Launching {batch_file_path}")
+	average = game_launcher.stats.average(snapshot[0], 'launcher_exit')
+	if average is not None:
+		launch_log.appendPlainText(f"This mod set's launcher usually exits after {average:.2f} s")
+	launch_dock.show()
+	game_launcher.launch(str(batch_file_path), str(parent_dir), snapshot, game_executable())
+
+def game_executable():
+	# e.g. eldenring.exe, lets the session time cover the game itself
+	try:
+		return config_store.load(config_path)[current_game].get('game_exe')
+	except Exception as e:
+		tracer.warning(f"Failed to read 'config.toml': {e}")
+		return None
+
+def show_launch_result(timings):
+	spawn = timings['spawn']
+	launcher_exit = timings['launcher_exit']
+	message = f"Session ended after {timings['session']:.2f} s"
+	if spawn is not None:
+		message += f" (spawned in {spawn * 1000:.0f} ms"
+		if launcher_exit is not None:
+			message += f", launcher exited after {launcher_exit:.2f} s"
+		message += ")"
+	launch_log.appendPlainText(message)
+	window.statusBar().showMessage(message, 10000)
+
+@tracer.traced('mod.toggle')
 def toggle_mod_status(checked, mod_name, config_game_path, mods):
-	# Update the 'enabled' status of the corresponding mod
-	for mod in mods:
-		if mod['name'] == mod_name:
-			mod['enabled'] = bool(checked)
-			break
-
-	# Write the updated mods list back to the TOML file
+	# Update the 'enabled' status of the corresponding mod and write the
+	# mods list back to the TOML file
 	try:
-		with open(config_game_path, 'r') as toml_file:
-			data = toml.load(toml_file)
+		apply_mod_states(config_game_path, {mod_name: checked}, mods)
+	except Exception as e:
+		tracer.warning(f"Failed to update the TOML file: {e}")
 
-		# Update the mods section
-		data['extension']['mod_loader']['mods'] = mods
+	# Only the conflict markers depend on the enabled state
+	update_conflicts()
 
-		with open(config_game_path, 'w') as toml_file:
-			toml.dump(data, toml_file)
-	except Exception as e:
-		print(f"Failed to update the TOML file: {e}")
 
-	refresh_ui()
+def selected_mod_names():
+	return table.selected_mod_names()
 
+def set_mods_enabled(states):
+	# states: {mod name: enabled}. The whole batch is one config write and
+	# one conflict update, however many mods it touches.
+	try:
+		if not apply_mod_states(config_game_path, states, mods):
+			return
+	except Exception as e:
+		tracer.warning(f"Failed to update the TOML file: {e}")
 
-def itemIDs():
-	if hasattr(sys, '_MEIPASS'):
-		# Running in a PyInstaller bundle
-		base_path = sys._MEIPASS
+	# Sync the checkboxes without firing toggle_mod_status for each of them
+	enabled = {mod['name']: mod['enabled'] for mod in mods}
+	mod_model.set_enabled({name: enabled.get(name, False) for name in states})
+	update_conflicts()
 
-	else:
-		# Running in a normal Python environment
-		base_path = os.path.abspath(".")
+def enableSelectedMods():
+	set_mods_enabled({name: True for name in selected_mod_names()})
+
+def disableSelectedMods():
+	set_mods_enabled({name: False for name in selected_mod_names()})
 
-	dictPath = os.path.join(base_path, 'parts.json')
+def invertSelectedMods():
+	enabled = {mod['name']: mod['enabled'] for mod in mods}
+	set_mods_enabled({name: not enabled.get(name, False) for name in selected_mod_names()})
 
-	# Load key-value pairs from the JSON file
-	with open(dictPath, 'r') as file:
-		IDs = json.load(file)
+def enableOnlySelectedMods():
+	selected = set(selected_mod_names())
+	# The root mod entry isn't a row in the table, leave it alone
+	set_mods_enabled({name: name in selected for name in mod_model.names()})
 
-	return IDs
+def tree_expand_depth():
+	# How many folder levels a mod's tree opens by itself, per game
+	try:
+		return int(config_store.load(config_path)[current_game].get('tree_expand_depth', 1))
+	except Exception as e:
+		tracer.warning(f"Failed to read 'config.toml': {e}")
+		return 1
 
+@tracer.traced('tree.open')
 def displayTree(ModName):
+	# The tree view is only imported once a mod is first opened
+	from fileViewer import DirTreeView
 	directory = os.path.dirname(config_game_path)
-	IDs = itemIDs()
+	# Parsed once per game and shared with the tree view
+	IDs = get_catalog(game_id(config_game_path))
 	# Construct the path to the 'mod' folder
 	mod_path = os.path.join(root_mods_path, ModName)
-	fileTree = DirTreeView(path=mod_path, itemIDs=IDs)
+	# Open the folders that hold conflicting files, the rest on demand
+	conflict_paths = [path[len(ModName) + 1:] for path in conflicts.get(ModName, [])]
+	fileTree = DirTreeView(path=mod_path, itemIDs=IDs, expand_depth=tree_expand_depth(), expand_paths=conflict_paths)
 	fileTree.setStyleSheet("""QTreeView, QTreeView * {background-color: rgba(12, 12, 12, 0.75);
 						color: white;
 						font-size: 16px;}
@@ -415,206 +521,400 @@ def displayTree(ModName):
 		}
 										   
 	""")
-	fileTree.tree_view.expandAll()
 	fileTree.path_label.setStyleSheet(
 		"color: white; font-size: 16px; background-color: rgba(0, 0, 0, 0.8); padding: 8px;")
-	splitter.replaceWidget(1, fileTree)
-	splitter.addWidget(fileTree)
+	# Swap out the previous tree instead of piling them up in the splitter
+	if splitter.count() > 1:
+		splitter.replaceWidget(1, fileTree).deleteLater()
+	else:
+		splitter.addWidget(fileTree)
 
 
-def refresh_ui():
-	global folders, mods, table, root_mods_path
+def enabled_names():
+	# Built once per table update, looking each row up in mods is O(n²)
+	return {mod['name'] for mod in mods if mod['enabled']}
+
+def mod_row(name, date, enabled):
+	return name, date, name in enabled, conflict_state(name)
+
+def conflict_state(name):
+	if name in conflicts:
+		return 'conflict'
+	if name in duplicates:
+		return 'duplicate'
+	return None
+
+def conflict_states():
+	return {name: conflict_state(name) for name in mod_model.names()}
+
+def hash_duplicates_enabled():
+	return hashDuplicatesAction.isChecked()
+
+def read_hash_duplicates():
+	# Hashing colliding files is opt-in per game
+	try:
+		return bool(config_store.load(config_path)[current_game].get('hash_duplicates', False))
+	except Exception as e:
+		tracer.warning(f"Failed to read 'config.toml': {e}")
+		return False
+
+def toggle_hash_duplicates(checked):
+	try:
+		config_data = config_store.load(config_path)
+		config_data[current_game]['hash_duplicates'] = checked
+		config_store.commit(config_path)
+	except Exception as e:
+		tracer.warning(f"Failed to update 'config.toml': {e}")
+	update_conflicts()
+
+@tracer.traced('scan.library')
+def scan_mod_library(config_game_path, token=None, hash_duplicates=False):
+	# Everything refresh_ui needs from disk, runs on the worker pool
 	root_mods_path = read_mod_folder_path(config_game_path)
 	folders = read_mod_folders(root_mods_path)
 	mods = read_mods(config_game_path)
 	disabled_mods = [mod['name'] for mod in mods if not mod['enabled']]
-	conflicts = conflictDetector(config_game_path, disabled_mods)
-	game_folders = ['chr','parts','sfx','menu']
-	# Clear the table first
-	table.setRowCount(0)
+	conflict_index = build_conflict_index(config_game_path, disabled_mods, mod_load_order(mods), token, hash_duplicates)
+	return root_mods_path, folders, mods, conflict_index
+
+def refresh_ui():
+	path = config_game_path
+	hash_duplicates = hash_duplicates_enabled()
+	library_scanner.start(lambda token: scan_mod_library(path, token, hash_duplicates))
+
+@tracer.traced('table.update')
+def populate_table(result):
+	global folders, mods, table, root_mods_path, conflicts, duplicates, conflict_index
+	root_mods_path, folders, mods, conflict_index = result
+	conflicts = conflict_index.conflicts()
+	duplicates = conflict_index.duplicates()
 	folders = [folder for folder in folders if folder[0] not in game_folders]
-	table.setRowCount(len(folders))
-	table.cellClicked.connect(lambda row, col: table.selectRow(row))
-	table.cellClicked.connect(lambda row, col: displayTree(table.item(row, 1).text()))
-
-	# Repopulate the table
-	for i, (name, date) in enumerate(folders):
-		chkBoxWidget = QWidget()
-		chkBoxLayout = QHBoxLayout(chkBoxWidget)
-		chkBoxLayout.setContentsMargins(8, 8, 8, 8)
-		chkBoxLayout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-		chkBox = QCheckBox()
-		chkBox.setChecked(
-			any(mod['name'] == name and mod['enabled'] for mod in mods))
-		# Ensure the partial function captures the current state of `mods`
-		chkBox.stateChanged.connect(partial(
-			toggle_mod_status, mod_name=name, config_game_path=config_game_path, mods=mods))
-		chkBoxLayout.addWidget(chkBox)
-		chkBoxWidget.setLayout(chkBoxLayout)
-		table.setCellWidget(i, 0, chkBoxWidget)
-
-		# Create QTableWidgetItem for name
-		nameItem = QTableWidgetItem(name)
-		# Create QTableWidgetItem for date
-		dateItem = QTableWidgetItem(date)
-
-		if name in conflicts:
-			nameItem.setBackground(QColor(150, 0, 50, 120))
-			dateItem.setBackground(QColor(150, 0, 50, 120))
-
-		table.setItem(i, 1, nameItem)
-		table.setItem(i, 2, dateItem)
-
-def read_mod_folder_path(config_game_path):
-	# Extract the directory of the config_game_path
-	directory = os.path.dirname(config_game_path)
-	try:
-		with open(config_game_path, 'r') as toml_file:
-			data = toml.load(toml_file)
-			# Construct the path to the 'mod' folder
-			return os.path.join(directory, data['extension']['mod_loader']['mods'][0]['path'])
-	except Exception as e:
-		print(f"Failed to read the mod path from the TOML file: {e}")
-		return os.path.join(directory, 'mod')
-
-def read_mod_folders(mod_folder_path):
-	
-	# Check if the 'mod' folder exists
-	if not os.path.exists(mod_folder_path):
-		print(f"The 'mod' folder does not exist at {mod_folder_path}")
-		return []
-	folders=[]
-	# List all folders in the 'mod' folder
-	for name in os.listdir(mod_folder_path):
-		folder_path = os.path.join(mod_folder_path, name)
-		if os.path.isdir(folder_path):
-			# Get the 'date modified' timestamp 
-			date_modified_timestamp = os.path.getmtime(folder_path)
-			date_modified = datetime.fromtimestamp(
-				date_modified_timestamp).strftime('%Y/%m/%d %H:%M')
-			folders.append((name, date_modified))
-	return folders
-
-def read_mods(config_game_path):
-	try:
-		# Open and parse the TOML file
-		with open(config_game_path, 'r') as toml_file:
-			data = toml.load(toml_file)
 
-		# Extract the 'mods' section
-		mods = data['extension']['mod_loader']['mods']
-		return mods
-	except FileNotFoundError:
-		print(f"File not found: {config_game_path}")
-		return []
-	except Exception as e:
-		print(f"An error occurred: {e}")
-		return []
+	# Only rows that actually changed are touched
+	first_fill = mod_model.rowCount() == 0
+	enabled = enabled_names()
+	mod_model.update_rows([mod_row(name, date, enabled) for name, date in folders])
+	if first_fill:
+		table.resizeColumnsToContents()
+	mod_watcher.watch(config_game_path, root_mods_path, [name for name, date in folders])
+	startup_timeline.mark('first scan')
+	startup_timeline.finish()
+
+def update_conflicts():
+	path = config_game_path
+	disabled_mods = [mod['name'] for mod in mods if not mod['enabled']]
+	load_order = mod_load_order(mods)
+	hash_duplicates = hash_duplicates_enabled()
+	conflict_scanner.start(lambda token: build_conflict_index(path, disabled_mods, load_order, token, hash_duplicates))
+
+@tracer.traced('table.states')
+def apply_conflicts(result):
+	global conflicts, duplicates, conflict_index
+	conflict_index = result
+	conflicts = conflict_index.conflicts()
+	duplicates = conflict_index.duplicates()
+	mod_model.set_states(conflict_states())
+
+def sync_mod_rows():
+	path = root_mods_path
+	folder_scanner.start(lambda token: read_mod_folders(path))
+
+@tracer.traced('table.sync')
+def apply_mod_rows(mod_folders):
+	# Add and remove rows for mod folders created or deleted outside the app
+	global folders
+	current = [folder for folder in mod_folders if folder[0] not in game_folders]
+	current_names = {name for name, date in current}
+	shown_names = set(mod_model.names())
+	enabled = enabled_names()
+	for name in shown_names - current_names:
+		mod_model.remove_row(name)
+	for name, date in current:
+		if name not in shown_names:
+			mod_model.add_row(mod_row(name, date, enabled))
+	folders = current
+	mod_watcher.watch_mods(current_names)
+
+def show_scan_state():
+	# Shows "Scanning…" in the status bar while any scan is still running
+	if any(scanner.busy() for scanner in (library_scanner, conflict_scanner, folder_scanner)):
+		window.statusBar().showMessage('Scanning…')
+	else:
+		window.statusBar().clearMessage()
+
+def sync_mod_states():
+	# Reload the mods list in place so the toggle callback keeps seeing it
+	mods[:] = read_mods(config_game_path)
+	enabled = {mod['name']: mod['enabled'] for mod in mods}
+	mod_model.set_enabled({name: enabled.get(name, False) for name in mod_model.names()})
+
+def apply_watched_changes(changed_dirs, config_changed):
+	# Our own debounced config writes come back through the watcher too,
+	# the table and the conflicts already reflect those
+	if config_changed and config_store.own_write(config_game_path):
+		config_changed = False
+	if not changed_dirs and not config_changed:
+		return
+	if root_mods_path in changed_dirs:
+		sync_mod_rows()
+	if config_changed:
+		sync_mod_states()
+	update_conflicts()
 
 def renameMod(root_mods_path):
-	currentRow = table.currentRow()
-	modName = table.item(currentRow, 1).text()
+	modName = table.current_mod_name()
+	if modName is None:
+		return
 	newName, ok = QInputDialog.getText(
 		None, 'Rename Mod', 'Enter new name for the mod:', QLineEdit.EchoMode.Normal, modName)
-	if ok and newName:
+	if ok and newName and newName != modName:
 		modPath = os.path.join(root_mods_path, modName)
 		newModPath = os.path.join(root_mods_path, newName)
-		try:
-			os.rename(modPath, newModPath)
-		except OSError as e:
-			print(f"Error renaming mod folder: {e}")
+		if os.path.exists(newModPath):
+			QMessageBox.warning(None, 'Rename Mod', f"A mod named {newName} already exists.")
 			return
-		
+		# The rename can stall for a long time while antivirus looks at the
+		# folder, so it happens on the thread pool
 		configPath = config_game_path
-		try:
-			with open(configPath, 'r') as tomlFile:
-				data = toml.load(tomlFile)
+		window.statusBar().showMessage(f"Renaming {modName}…")
+		rename = tracer.traced('mod.rename')(os.rename)
+		file_jobs.run(lambda token: rename(modPath, newModPath),
+					  done=lambda result: finishRename(configPath, modName, newName),
+					  failed=lambda error: showFileError('Rename Mod', error))
+
+@tracer.traced('mod.rename.config')
+def finishRename(configPath, modName, newName):
+	window.statusBar().clearMessage()
+	try:
+		data = config_store.load(configPath)
 
-			mods = data['extension']['mod_loader']['mods']
-			for mod in mods:
-				if mod['name'] == modName:
-					mod['name'] = newName
-					mod['path'] = f"{data['extension']['mod_loader']['mods'][0]['path']}/{newName}"
-					break
+		mods = data['extension']['mod_loader']['mods']
+		for mod in mods:
+			if mod['name'] == modName:
+				mod['name'] = newName
+				mod['path'] = f"{data['extension']['mod_loader']['mods'][0]['path']}/{newName}"
+				break
 
-			data['extension']['mod_loader']['mods'] = mods
+		data['extension']['mod_loader']['mods'] = mods
 
-			with open(configPath, 'w') as tomlFile:
-				toml.dump(data, tomlFile)
-		except Exception as e:
-			print(f"Error updating config file: {e}")
-			return
-		
-		table.item(currentRow, 1).setText(newName)
+		config_store.commit(configPath, ['extension.mod_loader.mods'])
+	except Exception as e:
+		tracer.error(f"Error updating config file: {e}")
+		return
+
+	# The user may have switched games while the rename ran
+	if configPath == config_game_path:
+		mod_model.rename_row(modName, newName)
+		update_conflicts()
+
+def showFileError(title, error):
+	window.statusBar().clearMessage()
+	QMessageBox.warning(None, title, error)
 
 def openModFolderInExplorer():
-	currentRow = table.currentRow()
-	modName = table.item(currentRow, 1).text()
+	modName = table.current_mod_name()
 	modPath = os.path.join(os.path.dirname(
 		config_game_path), 'mod', modName)
 	os.startfile(modPath)
 
+def showModConflicts():
+	# Answered straight from the conflict index, nothing is rescanned
+	modName = table.current_mod_name()
+	wins = conflict_index.wins(modName)
+	losses = conflict_index.losses(modName)
+	lines = [f"Overrides {len(wins)} file(s) from other mods."]
+	for path in losses[:20]:
+		lines.append(f"Loses {path} to {conflict_index.winner(path)}")
+	if len(losses) > 20:
+		lines.append(f"...and {len(losses) - 20} more")
+	above, taken = conflict_index.move_up(modName)
+	if above:
+		lines.append(f"Moving it above {above} would take over {len(taken)} file(s).")
+	QMessageBox.information(None, f'Conflicts: {modName}', '\n'.join(lines))
+
 def showContextMenu(position):
 	contextMenu = QMenu()
+	enableAction = contextMenu.addAction("Enable Selected")
+	disableAction = contextMenu.addAction("Disable Selected")
+	invertAction = contextMenu.addAction("Invert Selected")
+	enableOnlyAction = contextMenu.addAction("Enable Only Selected")
+	contextMenu.addSeparator()
 	deleteAction = contextMenu.addAction("Delete")
 	renameAction = contextMenu.addAction("Rename")
 	openInExplorerAction = contextMenu.addAction("Open in Explorer")  # Add "Open in Explorer" action
+	conflictsAction = contextMenu.addAction("Show Conflicts")
 	action = contextMenu.exec(table.mapToGlobal(position))
-	if action == deleteAction:
+	if action == enableAction:
+		enableSelectedMods()
+	elif action == disableAction:
+		disableSelectedMods()
+	elif action == invertAction:
+		invertSelectedMods()
+	elif action == enableOnlyAction:
+		enableOnlySelectedMods()
+	elif action == conflictsAction:
+		showModConflicts()
+	elif action == deleteAction:
 		deleteMod(root_mods_path)
 	elif action == openInExplorerAction:  # Check if "Open in Explorer" action was triggered
 		openModFolderInExplorer()
 	elif action == renameAction:
 		renameMod(root_mods_path)
 
+@tracer.traced('mod.delete')
 def deleteMod(root_mods_path):
-	reply = QMessageBox.question(None, 'Confirm Delete', 'Are you sure you want to delete this mod?',
+	# Moves every selected mod to the trash, with a single config write for
+	# all of them. The files are removed later by purgeTrash.
+	modNames = selected_mod_names()
+	if not modNames:
+		return
+	question = 'Are you sure you want to delete this mod?' if len(modNames) == 1 else f'Are you sure you want to delete these {len(modNames)} mods?'
+	reply = QMessageBox.question(None, 'Confirm Delete', question,
 								 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
 	if reply == QMessageBox.StandardButton.Yes:
-		currentRow = table.currentRow()
-		modName = table.item(currentRow, 1).text()
-		modPath = os.path.join(root_mods_path, modName)
-		try:
-			shutil.rmtree(modPath)
-		except OSError as e:
-			print(f"Error deleting mod folder: {e}")
+		deleted = []
+		for modName in modNames:
+			try:
+				deleted.append((modName, move_to_trash(root_mods_path, modName)))
+			except OSError as e:
+				tracer.error(f"Error deleting mod folder: {e}")
+		if not deleted:
 			return
-		
+		deleted_names = {modName for modName, entry in deleted}
+
 		configPath = config_game_path
+		removed = []
 		try:
-			with open(configPath, 'r') as tomlFile:
-				data = toml.load(tomlFile)
+			data = config_store.load(configPath)
 
 			mods = data['extension']['mod_loader']['mods']
-			for mod in mods:
-				if mod['name'] == modName:
-					mods.remove(mod)
-					break
+			removed = [(index, mod) for index, mod in enumerate(mods) if mod['name'] in deleted_names]
+			mods[:] = [mod for mod in mods if mod['name'] not in deleted_names]
 
 			data['extension']['mod_loader']['mods'] = mods
 
-			with open(configPath, 'w') as tomlFile:
-				toml.dump(data, tomlFile)
+			config_store.commit(configPath, ['extension.mod_loader.mods'])
 		except Exception as e:
-			print(f"Error updating config file: {e}")
-			return
-		
-		table.removeRow(currentRow)
-
-app = QApplication([])
-window = QMainWindow()
+			tracer.error(f"Error updating config file: {e}")
+
+		# What undoDelete needs to put everything back
+		trash_batches.append({
+			'root_mods_path': root_mods_path,
+			'config_game_path': configPath,
+			'trashed': deleted,
+			'config_entries': removed,
+		})
+		undoDeleteAction.setEnabled(True)
+		purge_timer.start()
+
+		for modName in deleted_names:
+			mod_model.remove_row(modName)
+		update_conflicts()
+
+def undoDelete():
+	# Restores the last batch of deleted mods, as long as the trash wasn't emptied
+	if not trash_batches:
+		return
+	batch = trash_batches.pop()
+	undoDeleteAction.setEnabled(bool(trash_batches))
+	restored = set()
+	for modName, entry in batch['trashed']:
+		try:
+			restore(batch['root_mods_path'], entry, modName)
+			restored.add(modName)
+		except OSError as e:
+			tracer.error(f"Error restoring mod folder: {e}")
+	if not restored:
+		return
+	try:
+		data = config_store.load(batch['config_game_path'])
+		mods = data['extension']['mod_loader']['mods']
+		for index, mod in batch['config_entries']:
+			if mod['name'] in restored:
+				mods.insert(min(index, len(mods)), mod)
+		config_store.commit(batch['config_game_path'], ['extension.mod_loader.mods'])
+	except Exception as e:
+		tracer.error(f"Error updating config file: {e}")
+	if batch['config_game_path'] == config_game_path:
+		sync_mod_rows()
+		update_conflicts()
+
+def purgeTrash():
+	# Empties every trash folder we put something in, plus the current one
+	# in case the last session left something behind
+	trash_dirs = {trash_path(batch['root_mods_path']) for batch in trash_batches}
+	trash_dirs.add(trash_path(root_mods_path))
+	trash_batches.clear()
+	undoDeleteAction.setEnabled(False)
+	purge_scanner.start(lambda token: purge(sorted(trash_dirs), token))
+
+def importArchive():
+	archive_path, _ = QFileDialog.getOpenFileName(window, 'Import Mod Archive', '', archive_filter())
+	if not archive_path:
+		return
+	# Reading the archive's file list is quick, but it still shouldn't
+	# happen on the GUI thread for a large archive on a slow drive
+	index = conflict_index
+	mods_path, game_path = root_mods_path, config_game_path
+	window.statusBar().showMessage(f"Reading {os.path.basename(archive_path)}…")
+	file_jobs.run(lambda token: ImportPlan(archive_path, mods_path, game_path, index),
+				  done=confirmImport,
+				  failed=lambda error: showFileError('Import Mod Archive', error))
+
+def confirmImport(plan):
+	window.statusBar().clearMessage()
+	if plan.root_mods_path != root_mods_path:
+		return
+	if os.path.exists(plan.target()):
+		QMessageBox.warning(window, 'Import Mod Archive', f"A mod named {plan.mod_name} already exists.")
+		return
+	lines = [f"Import {len(plan.members)} file(s) as {plan.mod_name}?"]
+	if plan.overlaps:
+		# New mods go to the end of the mods array, so they lose every clash
+		lines.append("These mods already ship some of its files and will keep overriding them:")
+		for name, paths in sorted(plan.overlaps.items(), key=lambda item: -len(item[1]))[:10]:
+			lines.append(f"{name}: {len(paths)} file(s)")
+	reply = QMessageBox.question(window, 'Import Mod Archive', '\n'.join(lines),
+								 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.Yes)
+	if reply == QMessageBox.StandardButton.Yes:
+		import_scanner.start(lambda token: extract(plan, token))
+
+def registerImportedMod(plan):
+	# One config write for the new mod, in the config of the game it was
+	# imported into
+	window.statusBar().showMessage(f"Imported {plan.mod_name}", 3000)
+	config = config_store.load(plan.config_game_path)
+	mods = config.setdefault('extension', {}).setdefault('mod_loader', {}).setdefault('mods', [])
+	# A stale entry whose folder had gone missing is reused as is
+	if not any(mod['name'] == plan.mod_name for mod in mods):
+		mods.append({
+			'enabled': True,
+			'name': plan.mod_name,
+			'path': f"{os.path.basename(plan.root_mods_path)}/{plan.mod_name}"
+		})
+		config_store.commit(plan.config_game_path, ['extension.mod_loader.mods'])
+	if plan.root_mods_path != root_mods_path:
+		return
+	sync_mod_rows()
+	update_conflicts()
+
+def show_import_progress(done, total):
+	if total:
+		window.statusBar().showMessage(f"Importing… {done * 100 // total}%")
+
+def show_purge_progress(done, total):
+	window.statusBar().showMessage(f"Emptying trash… {done}/{total}")
 
 def showAddModDialog():
 	dialog = AddModDialog()
 	if dialog.exec() == QDialog.DialogCode.Accepted:
 		modName = dialog.nameLineEdit.text()
 		if modName:
-			print('root '+root_mods_path)
+			tracer.debug(f"Adding an empty mod to {root_mods_path}")
 			modPath = os.path.join(root_mods_path, modName)
 			os.makedirs(modPath, exist_ok=True)
 			# Load the existing configuration
-			with open(config_game_path, 'r') as file:
-				config = toml.load(file)
+			config = config_store.load(config_game_path)
 
 			extension = config.setdefault('extension', {})
 			mod_loader = extension.setdefault('mod_loader', {})
@@ -627,167 +927,296 @@ def showAddModDialog():
 			})
 
 			# Write the updated configuration back to the file
-			with open(config_game_path, 'w') as file:
-				toml.dump(config, file)
+			config_store.commit(config_game_path, ['extension.mod_loader.mods'])
 			dialog.accept()
-			refresh_ui()
-
-if config_game_path:
-	print(f"Found non-empty 'path': {config_game_path}")
-else:
-	print("The 'path' variable is empty.")
-	dialog = InitDialog()
-	if dialog.exec() == QDialog.DialogCode.Accepted:
-		game_name = dialog.GameNameLineEdit.text()
-		selected_path = dialog.pathLineEdit.text()
-		print(f"Selected Path: {selected_path}")
+			sync_mod_rows()
+			update_conflicts()
+
+def create_dll_pane():
+	# dllOrganizer is only imported once the window is on screen
+	from dllOrganizer import dllOrganizer
+	return dllOrganizer(config_game_path, current_game)
+
+@tracer.traced('table.cached')
+def paint_cached_rows():
+	# Shows the table as it was last session until the first scan replaces it
+	global folders
+	rows = load_rows(current_game, config_game_path)
+	if not rows:
+		return
+	enabled = {mod['name']: mod['enabled'] for mod in mods}
+	folders = [(name, date) for name, date, was_enabled, state in rows]
+	mod_model.set_rows([(name, date, enabled.get(name, False), state) for name, date, was_enabled, state in rows])
+	table.resizeColumnsToContents()
 
-		# Load the existing config, update the path, and write it back to the file
-		try:
-			config_data = toml.load('config.toml')
-		except Exception as e:
-			print(f"Failed to load 'config.toml': {e}")
-			config_data = {}  # Create an empty config if loading fails
-
-		 # Ensure the game_name key exists in the config_data dictionary
-		if game_name not in config_data:
-			config_data[game_name] = {}
-
-		# Update the path in the config
-		config_data['current_game'] = game_name
-		config_data[game_name]['path'] = selected_path
-		config_game_path = selected_path
-		current_game = game_name
-
-		# Write the updated config back to 'config.toml'
-		with open('config.toml', 'w', encoding='utf-8') as config_file:
-			toml.dump(config_data, config_file)
+def save_session_cache():
+	if config_game_path:
+		save_rows(current_game, config_game_path, mod_model.rows)
+
+class FirstPaint(QObject):
+	# Starts the deferred part of startup once the main window has painted
+	def eventFilter(self, obj, event):
+		if event.type() == QEvent.Type.Paint:
+			obj.removeEventFilter(self)
+			startup_timeline.mark('first paint')
+			QTimer.singleShot(0, finish_startup)
+		return False
+
+def finish_startup():
+	# Scans and the DLL pane, in the background of a window that's already up
+	global dll_pane
+	if dll_pane is not None:
+		return
+	refresh_ui()
+	dll_pane = create_dll_pane()
+	parent_splitter.addWidget(dll_pane)
+	startup_timeline.mark('dll pane')
+	if os.path.isdir(trash_path(root_mods_path)):
+		purgeTrash()
+
+def build_window():
+	# Sets up the app and shows the main window, False when there's no
+	# game to show
+	global app, window, toolbar, hashDuplicatesAction, undoDeleteAction, importArchiveAction, first_paint
+	global config_game_path, current_game, root_mods_path, folders, mods, conflict_index, conflicts, duplicates
+	global table, mod_model, mod_watcher, library_scanner, conflict_scanner, folder_scanner
+	global file_jobs, trash_batches, purge_scanner, import_scanner, purge_timer
+	global launch_log, launch_dock, perf_panel, perf_dock, game_launcher, splitter, parent_splitter, dll_pane
+	load_game_config()
+	startup_timeline.mark('config')
+	app = QApplication([])
+	# Debounced config writes go through the event loop, and whatever is
+	# still pending gets written before the app exits
+	config_store.scheduler = lambda delay, fn: QTimer.singleShot(int(delay * 1000), fn)
+	app.aboutToQuit.connect(config_store.flush)
+	window = QMainWindow()
+	startup_timeline.mark('qt')
+
+	if config_game_path:
+		tracer.debug(f"Found non-empty 'path': {config_game_path}")
 	else:
-		print("bye")
-		sys.exit(0)
-
-if config_game_path:
-	toolbar = QToolBar("Main Toolbar")
-	window.addToolBar(toolbar)
-	toolbar.setStyleSheet("""
-	QToolBar {
-		background-color: rgba(0, 0, 0, 0.7);
-	}
-	QToolBar * {
-		color: white;
-		font-size: 18px;
-	}
-	""")
-	# Will replace plain text with icons later
-	runGame = QAction("Run Game", window)
-	toolbar.addAction(runGame)
-	runGame.triggered.connect(runBat)
-	changeGame = QAction("Change Game", window)
-	toolbar.addAction(changeGame)
-	changeGame.triggered.connect(lambda: SwitchGameDialog().exec())
-	addModAction = QAction("Add Empty Mod", window)
-	toolbar.addAction(addModAction)
-	root_mods_path = read_mod_folder_path(config_game_path)
-	addModAction.triggered.connect(showAddModDialog)
-
-	window.setWindowTitle('Mod Engine Organizer')
-	# some weird schenanigans to get the icon to work after building
-	basePath = sys._MEIPASS if getattr(
-		sys, 'frozen', False) else os.path.dirname(__file__)
-	iconPath = os.path.join(basePath, 'icon.ico').replace('\\', '/')
-	bgImagePath = os.path.join(basePath, 'bg.png').replace('\\', '/')
-	window.setWindowIcon(QIcon(iconPath))
-	window.setStyleSheet(f"""
-	QMainWindow {{
-		background-image: url("{bgImagePath}");
-		background-repeat: no-repeat;
-		background-position: center;
-		color: white;
-	}}
-	""")
+		tracer.debug("The 'path' variable is empty.")
+		dialog = InitDialog()
+		if dialog.exec() == QDialog.DialogCode.Accepted:
+			game_name = dialog.GameNameLineEdit.text()
+			selected_path = dialog.pathLineEdit.text()
+			tracer.debug(f"Selected Path: {selected_path}")
 
-	window.setGeometry(100, 100, 1024, 600)
-	root_mods_path = read_mod_folder_path(config_game_path)
-	folders = read_mod_folders(root_mods_path)
-	mods = read_mods(config_game_path)
+			# Load the existing config, update the path, and write it back to the file
+			try:
+				config_data = config_store.load(config_path)
+			except Exception as e:
+				tracer.warning(f"Failed to load 'config.toml': {e}")
+				config_data = {}  # Create an empty config if loading fails
 
-	central_widget = QWidget()
-	central_layout = QHBoxLayout(central_widget)
-
-	# Create a scroll area
-	# scroll_area = QScrollArea()
-	# scroll_area.setWidgetResizable(True)  # Make the scroll area resizable
-	# scroll_area.setStyleSheet(
-	# 	"QScrollArea {background-color: rgba(0, 0, 0, 0.1);}")
-
-	class CustomTableWidget(QTableWidget):
-		def __init__(self, deleteModFunc, *args, **kwargs):
-			super(CustomTableWidget, self).__init__(*args, **kwargs)
-			self.deleteModFunc = deleteModFunc
-			self.root_mods_path = root_mods_path
-
-		def keyPressEvent(self, event):
-			if event.key() == Qt.Key.Key_Delete:
-				self.deleteModFunc(self.root_mods_path)
-			else:
-				super().keyPressEvent(event)
-
-	table = CustomTableWidget(deleteMod, len(folders), 3)
-	# Set column headers
-	table.setHorizontalHeaderLabels(["", "Name", "Date Modified"])
-	table.setStyleSheet("""QTableWidget, QTableWidget * {background-color: rgba(0, 0, 0, 0.65);
-						color: white;
-					 	padding: 4px;
-						font-size: 16px;}
-						QTableCornerButton::section {
-						background-color: rgba(0, 0, 0, 0);
-						border: none;
-						}""")
-	table.verticalHeader().setStyleSheet("""
-		QHeaderView::section {
-			background-color: rgba(0, 0, 0, 0.8);
-			color: white;
-			font-size: 16px;
-			border: none;
+			 # Ensure the game_name key exists in the config_data dictionary
+			if game_name not in config_data:
+				config_data[game_name] = {}
+
+			# Update the path in the config
+			config_data['current_game'] = game_name
+			config_data[game_name]['path'] = selected_path
+			config_game_path = selected_path
+			current_game = game_name
+
+			# Write the updated config back to 'config.toml'
+			config_store.set(config_path, config_data)
+		else:
+			tracer.info("No game selected, quitting")
+			sys.exit(0)
+
+	if config_game_path:
+		toolbar = QToolBar("Main Toolbar")
+		window.addToolBar(toolbar)
+		toolbar.setStyleSheet("""
+		QToolBar {
+			background-color: rgba(0, 0, 0, 0.7);
 		}
-	""")
-	table.horizontalHeader().setStyleSheet("""
-		QHeaderView::section {
-			background-color: rgba(0, 0, 0, 0.8);
+		QToolBar * {
 			color: white;
-			font-size: 16px;
-			border: 0.5px solid rgba(255, 255, 255, 0.4);
+			font-size: 18px;
 		}
-	""")
-
-	# Populate the table for the first time
-	refresh_ui()
-
-	table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-	table.customContextMenuRequested.connect(showContextMenu)
-	# Adjust table settings
-	table.resizeColumnsToContents()
-	# table.setColumnWidth(1, 400)  # Adjust the width of the 'Name' column
-	table.setSortingEnabled(True)
-
-	# Add the table to the scroll area
-	# scroll_area.setWidget(table)
-
-	
-
-	splitter = QSplitter()
-	splitter.addWidget(table)
-	parent_splitter = QSplitter()
-	parent_splitter.addWidget(splitter)
-	
-	parent_splitter.setStretchFactor(0, 4)
-	parent_splitter.setStretchFactor(1, 1)
-	central_layout.addWidget(parent_splitter)
-
-	
-	# Set the central widget as the main window's central widget
-	window.setCentralWidget(central_widget)
-
-	window.show()
-	parent_splitter.addWidget(dllOrganizer(config_game_path, current_game))
-	sys.exit(app.exec())
+		""")
+		# Will replace plain text with icons later
+		runGame = QAction("Run Game", window)
+		toolbar.addAction(runGame)
+		runGame.triggered.connect(runBat)
+		changeGame = QAction("Change Game", window)
+		toolbar.addAction(changeGame)
+		changeGame.triggered.connect(lambda: SwitchGameDialog().exec())
+		addModAction = QAction("Add Empty Mod", window)
+		toolbar.addAction(addModAction)
+		addModAction.triggered.connect(showAddModDialog)
+		hashDuplicatesAction = QAction("Check Duplicates", window)
+		hashDuplicatesAction.setCheckable(True)
+		hashDuplicatesAction.setChecked(read_hash_duplicates())
+		toolbar.addAction(hashDuplicatesAction)
+		hashDuplicatesAction.toggled.connect(toggle_hash_duplicates)
+		undoDeleteAction = QAction("Undo Delete", window)
+		undoDeleteAction.setShortcut(QKeySequence.StandardKey.Undo)
+		undoDeleteAction.setEnabled(False)
+		toolbar.addAction(undoDeleteAction)
+		undoDeleteAction.triggered.connect(undoDelete)
+		importArchiveAction = QAction("Import Archive", window)
+		toolbar.addAction(importArchiveAction)
+		importArchiveAction.triggered.connect(importArchive)
+
+		window.setWindowTitle('Mod Engine Organizer')
+		# some weird schenanigans to get the icon to work after building
+		basePath = sys._MEIPASS if getattr(
+			sys, 'frozen', False) else os.path.dirname(__file__)
+		iconPath = os.path.join(basePath, 'icon.ico').replace('\\', '/')
+		bgImagePath = os.path.join(basePath, 'bg.png').replace('\\', '/')
+		window.setWindowIcon(QIcon(iconPath))
+		window.setStyleSheet(f"""
+		QMainWindow {{
+			background-image: url("{bgImagePath}");
+			background-repeat: no-repeat;
+			background-position: center;
+			color: white;
+		}}
+		""")
+
+		window.setGeometry(100, 100, 1024, 600)
+		root_mods_path = read_mod_folder_path(config_game_path)
+		folders = []
+		mods = read_mods(config_game_path)
+		# Filled in by the first scan
+		conflict_index = ConflictIndex({})
+		conflicts = {}
+		duplicates = {}
+
+		central_widget = QWidget()
+		central_layout = QHBoxLayout(central_widget)
+
+		# Create a scroll area
+		# scroll_area = QScrollArea()
+		# scroll_area.setWidgetResizable(True)  # Make the scroll area resizable
+		# scroll_area.setStyleSheet(
+		# 	"QScrollArea {background-color: rgba(0, 0, 0, 0.1);}")
+
+		# Rows live in a model, the view only paints what is on screen
+		table = ModTableView(lambda: deleteMod(root_mods_path))
+		mod_model = table.mod_model
+		mod_model.toggled.connect(lambda name, checked: toggle_mod_status(checked, name, config_game_path, mods))
+		table.clicked.connect(lambda index: displayTree(table.current_mod_name()))
+		table.setStyleSheet("""QTableView, QTableView * {background-color: rgba(0, 0, 0, 0.65);
+							color: white;
+						 	padding: 4px;
+							font-size: 16px;}
+							QTableCornerButton::section {
+							background-color: rgba(0, 0, 0, 0);
+							border: none;
+							}""")
+		table.verticalHeader().setStyleSheet("""
+			QHeaderView::section {
+				background-color: rgba(0, 0, 0, 0.8);
+				color: white;
+				font-size: 16px;
+				border: none;
+			}
+		""")
+		table.horizontalHeader().setStyleSheet("""
+			QHeaderView::section {
+				background-color: rgba(0, 0, 0, 0.8);
+				color: white;
+				font-size: 16px;
+				border: 0.5px solid rgba(255, 255, 255, 0.4);
+			}
+		""")
+
+		# Changes made outside the app are applied row by row
+		mod_watcher = ModWatcher()
+		mod_watcher.changed.connect(apply_watched_changes)
+
+		# Disk scans run on the thread pool and report back here
+		library_scanner = Scanner()
+		library_scanner.finished.connect(populate_table)
+		conflict_scanner = Scanner()
+		conflict_scanner.finished.connect(apply_conflicts)
+		folder_scanner = Scanner()
+		folder_scanner.finished.connect(apply_mod_rows)
+		for scanner in (library_scanner, conflict_scanner, folder_scanner):
+			scanner.started.connect(show_scan_state)
+			scanner.finished.connect(show_scan_state)
+			scanner.failed.connect(show_scan_state)
+		# Renames and trash removal run off the GUI thread too
+		file_jobs = Jobs()
+		trash_batches = []
+		purge_scanner = Scanner()
+		purge_scanner.progress.connect(show_purge_progress)
+		purge_scanner.finished.connect(lambda result: window.statusBar().showMessage('Trash emptied', 3000))
+		purge_scanner.failed.connect(lambda error: showFileError('Empty Trash', error))
+		import_scanner = Scanner()
+		import_scanner.progress.connect(show_import_progress)
+		import_scanner.finished.connect(registerImportedMod)
+		import_scanner.failed.connect(lambda error: showFileError('Import Mod Archive', error))
+		purge_timer = QTimer()
+		purge_timer.setSingleShot(True)
+		purge_timer.setInterval(trash_delay * 1000)
+		purge_timer.timeout.connect(purgeTrash)
+
+		# The game runs in its own process, its output goes to a log pane
+		launch_log = QPlainTextEdit()
+		launch_log.setReadOnly(True)
+		launch_log.setMaximumBlockCount(2000)
+		launch_log.setStyleSheet("background-color: rgba(12, 12, 12, 0.75); color: white;")
+		launch_dock = QDockWidget("Launch Log", window)
+		launch_dock.setWidget(launch_log)
+		window.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, launch_dock)
+		launch_dock.hide()
+		game_launcher = GameLauncher(parent=window)
+		game_launcher.output.connect(launch_log.appendPlainText)
+		game_launcher.started.connect(lambda: window.statusBar().showMessage('Game running…'))
+		game_launcher.finished.connect(show_launch_result)
+
+		# Recent span timings, so a slow click can be traced on the spot
+		perf_panel = PerformancePanel()
+		perf_panel.setStyleSheet("background-color: rgba(12, 12, 12, 0.75); color: white;")
+		perf_dock = QDockWidget("Performance", window)
+		perf_dock.setWidget(perf_panel)
+		window.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, perf_dock)
+		perf_dock.hide()
+		toolbar.addAction(perf_dock.toggleViewAction())
+
+		# Last session's rows until the first scan, which starts after the first paint
+		paint_cached_rows()
+
+		table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+		table.customContextMenuRequested.connect(showContextMenu)
+		# table.setColumnWidth(1, 400)  # Adjust the width of the 'Name' column
+		table.setSortingEnabled(True)
+
+		# Add the table to the scroll area
+		# scroll_area.setWidget(table)
+
+
+
+		splitter = QSplitter()
+		splitter.addWidget(table)
+		parent_splitter = QSplitter()
+		parent_splitter.addWidget(splitter)
+
+		parent_splitter.setStretchFactor(0, 4)
+		parent_splitter.setStretchFactor(1, 1)
+		central_layout.addWidget(parent_splitter)
+
+
+		# Set the central widget as the main window's central widget
+		window.setCentralWidget(central_widget)
+
+		app.aboutToQuit.connect(save_session_cache)
+		startup_timeline.mark('window built')
+		# The DLL pane and the scans wait for the first paint
+		dll_pane = None
+		first_paint = FirstPaint()
+		window.installEventFilter(first_paint)
+		window.show()
+	return bool(config_game_path)
+
+def main():
+	if build_window():
+		sys.exit(app.exec())
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import io
+import json
+import shutil
+import tempfile
+import contextlib
+
+# Runs `meo dll-order` against a generated install and checks that changing
+# one DLL leaves the load order of every other DLL alone:
+#   python benchmarks/checkDllOrder.py
+# Exits with 1 and says what moved when a check fails.
+
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(bench_dir))
+
+from generateLibrary import generate
+from configStore import config_store
+import meo
+
+def enabled_dlls(config_game_path):
+	return list(config_store.load(config_game_path)['modengine']['external_dlls'])
+
+def run_meo(*argv):
+	# (exit code, parsed JSON output) of meo.main
+	output = io.StringIO()
+	with contextlib.redirect_stdout(output):
+		code = meo.main(list(argv))
+	return code, json.loads(output.getvalue())
+
+def check(root):
+	config_game_path = generate(root, mods=5, files=2, dlls=12)
+	config_path = os.path.join(root, 'config.toml')
+	before = enabled_dlls(config_game_path)
+	if len(before) < 2:
+		return [f"The generated install enables only {before}"]
+	target = before[0]
+	code, result = run_meo('--config', config_path, 'dll-order', '--disable', target)
+	if code != 0:
+		return [f"meo failed: {result}"]
+	problems = []
+	after = enabled_dlls(config_game_path)
+	if after != before[1:]:
+		problems.append(f"Disabling {target} changed the enabled order from {before} to {after}")
+	shown = [entry['dll'] for entry in result['dlls'] if entry['enabled']]
+	if shown != after:
+		problems.append(f"meo showed {shown} but saved {after}")
+	if not problems:
+		print(f"Disabled {target}, the other {len(after)} enabled DLLs kept their order")
+	return problems
+
+def main():
+	root = tempfile.mkdtemp(prefix='meo-dll-order-')
+	try:
+		problems = check(root)
+	finally:
+		shutil.rmtree(root, ignore_errors=True)
+	for problem in problems:
+		print(problem)
+	return 1 if problems else 0
+
+if __name__ == '__main__':
+	sys.exit(main())
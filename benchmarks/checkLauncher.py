@@ -0,0 +1,84 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+# Runs GameLauncher against a stub launcher script instead of the game and
+# checks that the launch's timings end up in launch_stats.json:
+#   python benchmarks/checkLauncher.py
+# Exits with 1 and says what was missing when a check fails.
+
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(bench_dir))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import QCoreApplication, QTimer
+from gameLauncher import GameLauncher, LaunchStats, config_snapshot
+
+# Stands in for launchmod_<game>.bat: prints a line, takes a moment, and
+# exits with a code the check looks for
+stub_exit_code = 3
+if os.name == 'nt':
+	stub_name = 'launchmod_stub.bat'
+	stub_text = f"@echo off\r\necho stub launcher\r\nping -n 2 127.0.0.1 >nul\r\nexit /b {stub_exit_code}\r\n"
+else:
+	stub_name = 'launchmod_stub.sh'
+	stub_text = f"echo stub launcher\nsleep 0.2\nexit {stub_exit_code}\n"
+
+# Seconds to wait for the stub before calling the check failed
+timeout = 30
+
+def check(root):
+	stub_path = os.path.join(root, stub_name)
+	with open(stub_path, 'w', encoding='utf-8') as stub_file:
+		stub_file.write(stub_text)
+	stats_path = os.path.join(root, 'launch_stats.json')
+	snapshot = config_snapshot({'extension': {'mod_loader': {'mods': [{'name': 'ModA', 'enabled': True}]}},
+								'modengine': {'external_dlls': ['a.dll']}})
+
+	app = QCoreApplication.instance() or QCoreApplication([])
+	launcher = GameLauncher(stats=LaunchStats(stats_path))
+	lines = []
+	results = []
+	launcher.output.connect(lines.append)
+	launcher.finished.connect(lambda timings: (results.append(timings), app.quit()))
+	QTimer.singleShot(timeout * 1000, app.quit)
+	launcher.launch(stub_path, root, snapshot)
+	app.exec()
+
+	problems = []
+	if not results:
+		return [f"The launcher didn't finish within {timeout} s"]
+	if 'stub launcher' not in lines:
+		problems.append(f"The stub's output didn't arrive: {lines}")
+	try:
+		with open(stats_path, 'r', encoding='utf-8') as stats_file:
+			runs = json.load(stats_file)[snapshot[0]]['runs']
+	except Exception as e:
+		return problems + [f"No runs recorded for snapshot {snapshot[0]}: {e}"]
+	run = runs[-1]
+	for key in ('spawn', 'launcher_exit', 'session'):
+		if not isinstance(run.get(key), (int, float)):
+			problems.append(f"{key} is missing: {run}")
+	if not problems and not run['spawn'] <= run['launcher_exit'] <= run['session']:
+		problems.append(f"Timings are out of order: {run}")
+	if run.get('exit_code') != stub_exit_code:
+		problems.append(f"Exit code {run.get('exit_code')} instead of {stub_exit_code}")
+	if not problems:
+		print(f"Snapshot {snapshot[0]}: spawn {run['spawn']:.3f} s, launcher exit {run['launcher_exit']:.3f} s, "
+			  f"session {run['session']:.3f} s")
+	return problems
+
+def main():
+	root = tempfile.mkdtemp(prefix='meo-launcher-')
+	try:
+		problems = check(root)
+	finally:
+		shutil.rmtree(root, ignore_errors=True)
+	for problem in problems:
+		print(problem)
+	return 1 if problems else 0
+
+if __name__ == '__main__':
+	sys.exit(main())
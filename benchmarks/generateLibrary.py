@@ -0,0 +1,101 @@
+import os
+import sys
+import random
+import argparse
+
+# Builds a fake ModEngine2 install for the benchmarks:
+#   <root>/config_<game>.toml     mods array with every generated mod
+#   <root>/launchmod_<game>.bat
+#   <root>/mod/Mod0000/chr/...    N mods, M files in each game folder
+#   <root>/config.toml            the organizer's own config, pointing at it
+#   DLLs scattered in the game folder, the mods and modengine2/
+# File contents are a few bytes, the scans only care about names.
+
+# File names in the style of the game's own, keyed by game folder
+name_patterns = {
+	'chr': 'c{:04d}.chrbnd.dcx',
+	'parts': 'am_m_{:04d}.partsbnd.dcx',
+	'sfx': 'sfxbnd_c{:04d}.ffxbnd.dcx',
+	'menu': '{:05d}.tpf.dcx',
+}
+
+def mod_name(number):
+	return f"Mod{number:04d}"
+
+def config_text(mods, disabled=(), dlls=()):
+	# Same layout as the config_<game>.toml ModEngine2 ships
+	mod_lines = ''.join(f'    {{ enabled = {"false" if name in disabled else "true"}, name = "{name}", path = "mod/{name}" }},\n'
+						for name in mods)
+	dll_lines = ''.join(f'    "{dll}",\n' for dll in dlls)
+	return ('# ModEngine2 config\n[modengine]\n# Enables debug mode\ndebug = false\n'
+			f'# DLLs to load\nexternal_dlls = [\n{dll_lines}]\n\n'
+			'# Mod loader\n[extension.mod_loader]\nenabled = true\nloose_params = false\n'
+			f'mods = [\n    {{ enabled = true, name = "default", path = "mod" }},\n{mod_lines}]\n\n'
+			'[extension.scylla_hide]\nenabled = false\n')
+
+def write_file(path, data):
+	with open(path, 'w', encoding='utf-8') as out_file:
+		out_file.write(data)
+
+def generate(root, mods=300, files=25, overlap=0.2, dlls=12, disabled=0.1, game='eldenring', seed=0):
+	# overlap: share of each mod's files that reuse a name other mods ship too
+	# disabled: share of mods switched off in the config
+	# Returns the path of config_<game>.toml
+	rng = random.Random(seed)
+	mod_root = os.path.join(root, 'mod')
+	os.makedirs(mod_root, exist_ok=True)
+	names = [mod_name(number) for number in range(mods)]
+	for number, name in enumerate(names):
+		for folder, pattern in name_patterns.items():
+			folder_path = os.path.join(mod_root, name, folder)
+			os.makedirs(folder_path, exist_ok=True)
+			for i in range(files):
+				if rng.random() < overlap:
+					# Drawn from a pool as big as one mod's share, so the same
+					# names come up across many mods
+					file_name = pattern.format(rng.randrange(files))
+				else:
+					file_name = pattern.format(files + number * files + i)
+				write_file(os.path.join(folder_path, file_name), name)
+
+	# DLLs the organizer should find, and one in modengine2/ it should skip
+	found = []
+	for i in range(dlls):
+		place = i % 3
+		if place == 0:
+			relative = f"dll{i}.dll"
+		elif place == 1:
+			relative = f"dlls/tool{i}/tool{i}.dll"
+		else:
+			relative = f"mod/{names[i % len(names)]}/mod{i}.dll" if names else f"dll{i}.dll"
+		os.makedirs(os.path.dirname(os.path.join(root, relative)), exist_ok=True)
+		write_file(os.path.join(root, relative), relative)
+		found.append(relative)
+	os.makedirs(os.path.join(root, 'modengine2'), exist_ok=True)
+	write_file(os.path.join(root, 'modengine2', 'modengine2.dll'), 'modengine2')
+
+	off = set(rng.sample(names, int(len(names) * disabled)))
+	config_game_path = os.path.join(root, f"config_{game}.toml")
+	write_file(config_game_path, config_text(names, off, found[::2]))
+	write_file(os.path.join(root, f"launchmod_{game}.bat"), '@echo off\n')
+	config_game_path = config_game_path.replace('\\', '/')
+	write_file(os.path.join(root, 'config.toml'),
+			   f'current_game = "{game}"\n\n[{game}]\npath = "{config_game_path}"\nexternal_dlls = []\n')
+	return config_game_path
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Build a fake ModEngine2 install to benchmark against.')
+	parser.add_argument('root', help='folder to create the install in')
+	parser.add_argument('--mods', type=int, default=300)
+	parser.add_argument('--files', type=int, default=25, help='files in each game folder of a mod')
+	parser.add_argument('--overlap', type=float, default=0.2, help='share of file names shared between mods')
+	parser.add_argument('--dlls', type=int, default=12)
+	parser.add_argument('--disabled', type=float, default=0.1, help='share of mods disabled in the config')
+	parser.add_argument('--game', default='eldenring')
+	parser.add_argument('--seed', type=int, default=0)
+	args = parser.parse_args(argv)
+	print(generate(args.root, args.mods, args.files, args.overlap, args.dlls, args.disabled, args.game, args.seed))
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
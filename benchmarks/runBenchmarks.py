@@ -0,0 +1,171 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+# Times the scan and config paths against generated installs and compares
+# them with the stored baselines:
+#   python benchmarks/runBenchmarks.py                 fail on regressions
+#   python benchmarks/runBenchmarks.py --update        store new baselines
+#   python benchmarks/runBenchmarks.py --sizes medium
+# Baselines are wall times from one machine, record them again with
+# --update when benchmarking somewhere else.
+
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(bench_dir))
+
+from generateLibrary import generate
+from fileIndex import file_index
+from fileHash import hash_cache
+from configStore import config_store
+from modCore import (conflictDetector, read_mod_folder_path, read_mod_folders, read_mods, apply_mod_states,
+					 get_dll_paths, read_dll_order)
+
+baselines_path = os.path.join(bench_dir, 'baselines.json')
+
+# Install sizes, 'medium' is about what a 300 mod setup looks like
+sizes = {
+	'small': {'mods': 30, 'files': 10},
+	'medium': {'mods': 300, 'files': 25},
+	'large': {'mods': 1000, 'files': 10},
+}
+
+# A run fails when a benchmark is this many times slower than its baseline
+# and also slower by more than `floor` seconds, so timer noise on the fast
+# ones doesn't fail the run
+tolerance = 1.5
+floor = 0.005
+
+def forget_listings():
+	# Cold start for the folder walks: nothing cached in the file index
+	with file_index.lock:
+		file_index.data = {}
+		file_index.dirty = False
+	file_index.loaded = True
+
+def forget_config(path):
+	with config_store.lock:
+		config_store.files.pop(os.path.abspath(path), None)
+
+def benchmarks(root, config_game_path, game):
+	# [(name, setup, run)], setup runs untimed before every run
+	config_path = os.path.join(root, 'config.toml')
+	mods = read_mods(config_game_path)
+	disabled = [mod['name'] for mod in mods if not mod['enabled']]
+	mod_root = read_mod_folder_path(config_game_path)
+	dll_paths = get_dll_paths(game, config_game_path, config_path=config_path)
+	toggled = mods[-1]['name']
+
+	def round_trip():
+		# Toggle one mod, write the file, and parse it again from disk
+		enabled = next(mod['enabled'] for mod in read_mods(config_game_path) if mod['name'] == toggled)
+		apply_mod_states(config_game_path, {toggled: not enabled})
+		config_store.flush()
+		forget_config(config_game_path)
+		return read_mods(config_game_path)
+
+	nothing = lambda: None
+	return [
+		('conflictDetector cold', forget_listings, lambda: conflictDetector(config_game_path, disabled)),
+		('conflictDetector warm', nothing, lambda: conflictDetector(config_game_path, disabled)),
+		('read_mod_folders', nothing, lambda: read_mod_folders(mod_root)),
+		('read_mods', lambda: forget_config(config_game_path), lambda: read_mods(config_game_path)),
+		('get_dll_paths cold', forget_listings, lambda: get_dll_paths(game, config_game_path, config_path=config_path)),
+		('get_dll_paths warm', nothing, lambda: get_dll_paths(game, config_game_path, config_path=config_path)),
+		('read_dict', lambda: forget_config(config_path),
+		 lambda: read_dll_order(game, config_game_path, dll_paths, config_path=config_path)),
+		('config round-trip', nothing, round_trip),
+	]
+
+def measure(setup, run, repeat):
+	# Best of `repeat` runs after one warm-up run, the slower ones are
+	# mostly other work on the machine (fsync in the round-trip especially)
+	setup()
+	run()
+	times = []
+	for _ in range(repeat):
+		setup()
+		start = time.perf_counter()
+		run()
+		times.append(time.perf_counter() - start)
+	return min(times)
+
+def run_size(size, repeat, game='eldenring'):
+	root = tempfile.mkdtemp(prefix=f"meo-bench-{size}-")
+	try:
+		config_game_path = generate(root, game=game, **sizes[size])
+		# Caches the benchmarks touch must not land next to the real ones
+		file_index.path = os.path.join(root, 'fileindex.json')
+		hash_cache.path = os.path.join(root, 'filehash.json')
+		forget_listings()
+		results = {}
+		for name, setup, run in benchmarks(root, config_game_path, game):
+			results[name] = measure(setup, run, repeat)
+		return results
+	finally:
+		shutil.rmtree(root, ignore_errors=True)
+
+def load_baselines(path=baselines_path):
+	try:
+		with open(path, 'r', encoding='utf-8') as baselines_file:
+			return json.load(baselines_file)
+	except FileNotFoundError:
+		return {}
+
+def save_baselines(baselines, path=baselines_path):
+	with open(path, 'w', encoding='utf-8') as baselines_file:
+		json.dump(baselines, baselines_file, indent=1, sort_keys=True)
+		baselines_file.write('\n')
+
+def compare(size, results, baselines):
+	# Prints one line per benchmark, returns the names that regressed
+	regressions = []
+	for name, seconds in results.items():
+		baseline = baselines.get(size, {}).get(name)
+		if baseline is None:
+			verdict = 'new'
+		elif seconds > baseline * tolerance and seconds - baseline > floor:
+			verdict = 'REGRESSION'
+			regressions.append(f"{size}/{name}")
+		else:
+			verdict = 'ok'
+		base_text = f"{baseline * 1000:9.2f} ms" if baseline is not None else ' ' * 12
+		print(f"{size:7} {name:24} {seconds * 1000:9.2f} ms  baseline {base_text}  {verdict}")
+	return regressions
+
+def main(argv=None):
+	global tolerance
+	parser = argparse.ArgumentParser(description='Benchmark the scan and config paths on generated installs.')
+	parser.add_argument('--sizes', nargs='+', choices=list(sizes), default=list(sizes))
+	parser.add_argument('--repeat', type=int, default=5)
+	parser.add_argument('--tolerance', type=float, default=tolerance)
+	parser.add_argument('--update', action='store_true', help='store these results as the new baselines')
+	args = parser.parse_args(argv)
+	tolerance = args.tolerance
+	# Writes are flushed by hand, nothing should fire in the background
+	config_store.scheduler = lambda delay, fn: None
+
+	baselines = load_baselines()
+	regressions = []
+	for size in args.sizes:
+		# Tracer output goes to stderr already, keep anything else printed out of the table too
+		with contextlib.redirect_stdout(sys.stderr):
+			results = run_size(size, args.repeat)
+		regressions += compare(size, results, baselines)
+		if args.update:
+			baselines[size] = {name: round(seconds, 6) for name, seconds in results.items()}
+	if args.update:
+		save_baselines(baselines)
+		print(f"Baselines written to {baselines_path}")
+		return 0
+	if regressions:
+		print(f"Slower than the baselines allow: {', '.join(regressions)}")
+		return 1
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+import contextlib
+
+# Drives the real window on the offscreen platform against generated
+# installs, no display needed:
+#   python benchmarks/uiBenchmarks.py
+#   python benchmarks/uiBenchmarks.py --sizes medium --json ui.json
+# For every interaction it reports wall time, how long the event loop was
+# blocked and the process's peak RSS. app.py keeps its state in module
+# globals, so every size runs in its own process.
+
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(bench_dir))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+try:
+	import resource
+except ImportError:
+	# Not on Windows, peak RSS is reported as missing there
+	resource = None
+
+from runBenchmarks import sizes
+from generateLibrary import generate
+
+# Heartbeat of the stall meter in ms
+tick = 5
+# How long to wait for a scan or a tree listing before giving up, in seconds
+timeout = 30
+
+def peak_rss():
+	# Peak resident set size of this process in MiB
+	if resource is None:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# Bytes on macOS, KiB everywhere else
+	return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def run_size(size, runs):
+	# Runs in the child process, returns {interaction: stats}
+	from PyQt6.QtCore import QObject, QTimer, QEventLoop, Qt
+	from PyQt6.QtWidgets import QApplication
+
+	class StallMeter(QObject):
+		# Ticks every `tick` ms, any lateness is time the event loop couldn't run
+		def __init__(self):
+			super().__init__()
+			self.timer = QTimer(self)
+			self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+			self.timer.setInterval(tick)
+			self.timer.timeout.connect(self.beat)
+			self.reset()
+
+		def reset(self):
+			self.last = time.perf_counter()
+			self.longest = 0
+			self.total = 0
+
+		def beat(self):
+			now = time.perf_counter()
+			late = (now - self.last) * 1000 - tick
+			self.last = now
+			if late > 0:
+				self.longest = max(self.longest, late)
+				self.total += late
+
+	def wait_until(condition):
+		deadline = time.perf_counter() + timeout
+		while not condition():
+			if time.perf_counter() > deadline:
+				raise TimeoutError('Timed out waiting for the window')
+			QApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, tick)
+
+	def settle():
+		# Let the meter see the end of whatever blocked the loop last
+		end = time.perf_counter() + 3 * tick / 1000
+		wait_until(lambda: time.perf_counter() > end)
+
+	results = {}
+
+	def measure(name, action, done=lambda: True, prepare=lambda: None):
+		walls = []
+		longest = 0
+		total = 0
+		for run in range(runs):
+			prepare()
+			settle()
+			meter.reset()
+			start = time.perf_counter()
+			action(run)
+			wait_until(done)
+			walls.append((time.perf_counter() - start) * 1000)
+			settle()
+			longest = max(longest, meter.longest)
+			total += meter.total
+		results[name] = {'runs': runs, 'wall_ms': round(statistics.median(walls), 2),
+						 'wall_max_ms': round(max(walls), 2), 'stall_max_ms': round(longest, 2),
+						 'stall_ms': round(total / runs, 2), 'peak_rss_mb': peak_rss()}
+
+	root = tempfile.mkdtemp(prefix=f"meo-ui-{size}-")
+	try:
+		generate(root, **sizes[size])
+		# app.py reads config.toml and keeps its caches in the working directory
+		os.chdir(root)
+		import app
+		from configStore import config_store
+
+		start = time.perf_counter()
+		app.build_window()
+		meter = StallMeter()
+		meter.timer.start()
+		wait_until(lambda: app.startup_timeline.finished and app.dll_pane.list_widget.count() > 0)
+		results['startup'] = {'runs': 1, 'wall_ms': round((time.perf_counter() - start) * 1000, 2),
+							  'phases': app.startup_timeline.report(), 'peak_rss_mb': peak_rss()}
+
+		measure('refresh_ui', lambda run: app.refresh_ui(), lambda: not app.library_scanner.busy())
+
+		names = app.mod_model.names()
+		trees = {}
+
+		def open_tree(run):
+			app.displayTree(names[run % len(names)])
+			tree = app.splitter.widget(1)
+			trees['current'] = tree
+		measure('displayTree', open_tree,
+				lambda: trees['current'].model.rowCount(trees['current'].tree_view.rootIndex()) > 0)
+
+		dll_list = app.dll_pane.list_widget
+
+		def drop_dll(run):
+			# What a drop does after Qt moved the row: reorder, write both configs
+			dll_list.insertItem(0, dll_list.takeItem(dll_list.count() - 1))
+			dll_list.update_items()
+			config_store.flush()
+		measure('dll drop', drop_dll)
+		app.window.close()
+	finally:
+		os.chdir(bench_dir)
+		shutil.rmtree(root, ignore_errors=True)
+	return results
+
+def run_child(size, runs):
+	# Every size gets a fresh interpreter and a fresh app.py
+	child = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', size, '--runs', str(runs)],
+						   capture_output=True, text=True)
+	if child.returncode != 0:
+		sys.stderr.write(child.stderr)
+		raise RuntimeError(f"The {size} run failed")
+	return json.loads(child.stdout.strip().splitlines()[-1])
+
+def report(size, results):
+	for name, stats in results.items():
+		rss = stats.get('peak_rss_mb')
+		rss_text = f"{rss:8.1f} MiB" if rss is not None else '         n/a'
+		if 'stall_max_ms' in stats:
+			print(f"{size:7} {name:12} {stats['wall_ms']:9.2f} ms  stall max {stats['stall_max_ms']:8.2f} ms  "
+				  f"stall/run {stats['stall_ms']:8.2f} ms  peak {rss_text}")
+		else:
+			print(f"{size:7} {name:12} {stats['wall_ms']:9.2f} ms  {'':43}peak {rss_text}")
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Time the main window on the offscreen platform.')
+	parser.add_argument('--sizes', nargs='+', choices=list(sizes), default=list(sizes))
+	parser.add_argument('--runs', type=int, default=10)
+	parser.add_argument('--json', help='also write the results to this file')
+	parser.add_argument('--child', choices=list(sizes), help=argparse.SUPPRESS)
+	args = parser.parse_args(argv)
+	if args.child:
+		stdout = sys.stdout
+		# app.py logs to stderr through the tracer, keep anything else printed off
+		# stdout too since the parent only reads the JSON line
+		with contextlib.redirect_stdout(sys.stderr):
+			results = run_size(args.child, args.runs)
+		stdout.write(json.dumps(results) + '\n')
+		return 0
+
+	all_results = {}
+	for size in args.sizes:
+		all_results[size] = run_child(size, args.runs)
+		report(size, all_results[size])
+	if args.json:
+		with open(args.json, 'w', encoding='utf-8') as json_file:
+			json.dump(all_results, json_file, indent=1)
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,142 @@
+import os
+import atexit
+import threading
+import toml
+from tomlPatch import patch_array
+from perfTrace import tracer
+
+class ConfigStore:
+	# Keeps every TOML file we touch parsed in memory. Callers edit the
+	# returned data in place and call commit(); writes are held back for
+	# `delay` seconds so a burst of edits ends up as a single write.
+	def __init__(self, delay=0.3, scheduler=None):
+		self.delay = delay
+		# scheduler(delay, fn) runs fn later, app.py swaps in a QTimer so
+		# writes happen on the GUI thread
+		self.scheduler = scheduler or self.schedule_thread
+		self.lock = threading.RLock()
+		# Key: absolute path, Value: [parsed data, mtime of the file we parsed
+		# or wrote, text of the file as it is on disk]
+		self.files = {}
+		# Key: absolute path, Value: dotted keys of the arrays that changed, or
+		# None when the whole document has to be dumped again
+		self.dirty = {}
+		# Key: absolute path, Value: mtime of the last write we made to it.
+		# Kept apart from the parse mtime so a file someone else changed and
+		# we merely reread never passes for our own write.
+		self.written = {}
+		self.generation = 0
+
+	def load(self, path):
+		# Raises like toml.load if the file is missing or broken
+		path = os.path.abspath(path)
+		with self.lock:
+			cached = self.files.get(path)
+			if cached is not None and path in self.dirty:
+				return cached[0]
+			mtime = os.stat(path).st_mtime
+			# Reparse only when someone else changed the file since
+			if cached is None or cached[1] != mtime:
+				with open(path, 'r', encoding='utf-8') as toml_file:
+					text = toml_file.read()
+				with tracer.span('toml.parse', path=path):
+					cached = [toml.loads(text), mtime, text]
+				self.files[path] = cached
+			return cached[0]
+
+	def own_write(self, path):
+		# True when the file on disk is the one we last wrote, e.g. when a
+		# file watcher reports our own write back to us
+		path = os.path.abspath(path)
+		with self.lock:
+			written = self.written.get(path)
+			if written is None:
+				return False
+			try:
+				return os.stat(path).st_mtime == written
+			except OSError:
+				return False
+
+	def set(self, path, data):
+		# Replace the whole document, e.g. when creating a file
+		path = os.path.abspath(path)
+		with self.lock:
+			self.files[path] = [data, None, None]
+		self.commit(path)
+
+	def commit(self, path, keys=None):
+		# keys: dotted keys of the arrays that were edited, e.g.
+		# 'extension.mod_loader.mods'. Those are patched into the existing
+		# text, without keys the whole file is dumped.
+		path = os.path.abspath(path)
+		with self.lock:
+			if keys is None or (path in self.dirty and self.dirty[path] is None):
+				self.dirty[path] = None
+			else:
+				self.dirty[path] = self.dirty.get(path, set()) | set(keys)
+			self.generation += 1
+			generation = self.generation
+		self.scheduler(self.delay, lambda: self.flush_if_idle(generation))
+
+	def flush_if_idle(self, generation):
+		# A newer commit restarted the debounce, its own callback will write
+		if generation == self.generation:
+			self.flush()
+
+	def flush(self):
+		with self.lock:
+			dirty = self.dirty
+			self.dirty = {}
+			for path, keys in dirty.items():
+				cached = self.files[path]
+				try:
+					with tracer.span('toml.write', path=path, patched=keys is not None):
+						text = self.render(cached[0], cached[2], keys)
+						cached[1] = self.write(path, text)
+						self.written[path] = cached[1]
+					cached[2] = text
+				except Exception as e:
+					tracer.warning(f"Failed to write {path}: {e}")
+
+	def render(self, data, text, keys):
+		# Patch only the edited arrays when we can, so comments and layout
+		# outside them stay as they are
+		if text is not None and keys is not None:
+			for key in sorted(keys):
+				value = data
+				for part in key.split('.'):
+					value = value.get(part) if isinstance(value, dict) else None
+				if not isinstance(value, list):
+					return toml.dumps(data)
+				text = patch_array(text, key, value)
+				if text is None:
+					return toml.dumps(data)
+			return text
+		return toml.dumps(data)
+
+	def write(self, path, text):
+		# Write next to the target and rename over it, a crash mid-write
+		# leaves the old file intact. Imported here so read-only runs of meo
+		# don't pay for it.
+		import tempfile
+		directory = os.path.dirname(path)
+		fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path), suffix='.tmp', dir=directory)
+		try:
+			with os.fdopen(fd, 'w', encoding='utf-8') as tmp_file:
+				tmp_file.write(text)
+				tmp_file.flush()
+				os.fsync(tmp_file.fileno())
+			os.replace(tmp_path, path)
+		except Exception:
+			os.unlink(tmp_path)
+			raise
+		return os.stat(path).st_mtime
+
+	def schedule_thread(self, delay, fn):
+		timer = threading.Timer(delay, fn)
+		timer.daemon = True
+		timer.start()
+
+# Shared store for config.toml and every config_<game>.toml
+config_store = ConfigStore()
+atexit.register(config_store.flush)
@@ -0,0 +1,98 @@
+import os
+
+def normalize_path(rel_path):
+	# The game looks files up case-insensitively with forward slashes
+	return rel_path.replace('\\', '/').lower()
+
+class ConflictIndex:
+	# Maps every relative path inside a mod to the mods that ship it, in load
+	# order. ModEngine2 serves a file from the first mod in the `mods` array
+	# that has it, so the first provider of a path is its winner.
+	def __init__(self, mod_files, load_order=()):
+		# mod_files: {mod name: [paths relative to the mod folder]}
+		# load_order: mod names as listed in config_<game>.toml
+		listed = [name for name in dict.fromkeys(load_order) if name in mod_files]
+		unlisted = sorted(name for name in mod_files if name not in set(listed))
+		self.order = listed + unlisted
+		self.rank = {name: i for i, name in enumerate(self.order)}
+		# Key: normalized path, Value: providers sorted by load order
+		self.providers = {}
+		# Key: mod name, Value: {normalized path: path as found on disk}
+		self.paths = {}
+		for name in self.order:
+			mod_paths = {}
+			for rel_path in mod_files[name]:
+				key = normalize_path(rel_path)
+				mod_paths[key] = rel_path
+				self.providers.setdefault(key, []).append(name)
+			self.paths[name] = mod_paths
+		# Key: mod name, Value: the paths it shares with at least one other mod
+		self.contested = {name: [] for name in self.order}
+		for key, providers in self.providers.items():
+			if len(providers) > 1:
+				for name in providers:
+					self.contested[name].append(key)
+		# Contested paths where every mod ships the very same bytes
+		self.identical = set()
+		# conflicts() and duplicates() results, a reused index answers again
+		# without regrouping
+		self.grouped = {}
+
+	def set_identical(self, keys):
+		self.identical = set(keys)
+		self.grouped = {}
+
+	def contested_paths(self):
+		# {normalized path: [(mod name, path as found on disk)]} for shared paths
+		return {key: [(name, self.paths[name][key]) for name in providers]
+				for key, providers in self.providers.items() if len(providers) > 1}
+
+	def winner(self, path):
+		providers = self.providers.get(normalize_path(path))
+		return providers[0] if providers else None
+
+	def losses(self, mod_name):
+		# Paths the mod ships that another mod overrides
+		return sorted(key for key in self.contested.get(mod_name, ())
+					  if self.providers[key][0] != mod_name and key not in self.identical)
+
+	def wins(self, mod_name):
+		# Contested paths the mod gets to serve
+		return sorted(key for key in self.contested.get(mod_name, ())
+					  if self.providers[key][0] == mod_name and key not in self.identical)
+
+	def move_up(self, mod_name):
+		# What changes if mod_name swaps places with the mod right above it.
+		# Only paths currently won by that neighbour can change hands, because
+		# nobody else sits between the two.
+		rank = self.rank.get(mod_name, 0)
+		if rank == 0:
+			return None, []
+		above = self.order[rank - 1]
+		taken = sorted(key for key in self.contested[mod_name]
+					   if self.providers[key][0] == above and key not in self.identical)
+		return above, taken
+
+	def conflicts(self):
+		# Same shape conflictDetector always returned: mod name -> its
+		# conflicting files, relative to the mod root folder
+		if 'conflicts' not in self.grouped:
+			self.grouped['conflicts'] = self.group(key for key, providers in self.providers.items()
+												   if len(providers) > 1 and key not in self.identical)
+		return self.grouped['conflicts']
+
+	def duplicates(self):
+		# Shared paths whose copies are byte-identical, harmless whoever wins
+		if 'duplicates' not in self.grouped:
+			self.grouped['duplicates'] = self.group(self.identical)
+		return self.grouped['duplicates']
+
+	def group(self, keys):
+		grouped = {}
+		for key in keys:
+			providers = self.providers[key]
+			if len(providers) < 2:
+				continue
+			for name in providers:
+				grouped.setdefault(name, []).append(os.path.join(name, self.paths[name][key]))
+		return grouped
@@ -0,0 +1,47 @@
+import os
+from fileIndex import file_index
+from modTrash import trash_dir_name
+
+# Folders ModEngine2 mods keep their assets in. DLLs never live there, so
+# discovery doesn't descend into them wherever they show up. modImport
+# uses the same set to tell a mod folder from its contents.
+asset_folders = {'action', 'asset', 'chr', 'event', 'font', 'map', 'menu', 'msg',
+				 'param', 'parts', 'script', 'sfx', 'sound', 'other'}
+
+# Roots relative to the folder holding config_<game>.toml, overridable per
+# game in config.toml with dll_include_roots / dll_exclude_roots
+default_include = ['']
+default_exclude = ['modengine2']
+
+def normalize_root(root):
+	root = root.replace('\\', '/').strip('/').lower()
+	return '' if root == '.' else root
+
+def find_dlls(base_dir, include=default_include, exclude=default_exclude, token=None, index=file_index):
+	# Relative paths ('dlls/foo.dll') of every DLL under the include roots.
+	# Listings come from the file index, so folders whose mtime didn't
+	# change since the last run are not listed again.
+	excluded = {normalize_root(root) for root in exclude}
+	dll_paths = {}
+	for root in include:
+		top = os.path.normpath(os.path.join(base_dir, root))
+		for dir_path, dirs, files in index.walk(top):
+			if token is not None:
+				token.check()
+			rel_dir = os.path.relpath(dir_path, base_dir).replace('\\', '/')
+			prefix = '' if rel_dir == '.' else rel_dir + '/'
+			dirs[:] = [d for d in dirs
+					   if d.lower() not in asset_folders and d != trash_dir_name
+					   and normalize_root(prefix + d) not in excluded]
+			for file in files:
+				if file.lower().endswith('.dll'):
+					dll_paths[prefix + file] = None
+	index.save()
+	return list(dll_paths)
+
+def reconcile(saved, found):
+	# Keeps the saved order for DLLs that are still there and appends new
+	# ones in the order they were found
+	found = dict.fromkeys(found)
+	kept = dict.fromkeys(dll for dll in saved if dll in found)
+	return list(kept) + [dll for dll in found if dll not in kept]
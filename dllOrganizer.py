@@ -1,8 +1,9 @@
 import sys
-import toml
-import os
 from PyQt6.QtWidgets import QLabel, QApplication, QWidget, QVBoxLayout, QListWidget, QListWidgetItem, QCheckBox, QListWidgetItem
 from PyQt6.QtCore import Qt
+from scanWorker import Scanner
+from modCore import get_dll_paths, read_dll_order, read_enabled_dlls, save_dll_list, save_enabled_dlls
+from perfTrace import tracer
 
 class DragDropListWidget(QListWidget):
 	def __init__(self, config_game_path, current_game, parent=None):
@@ -10,14 +11,28 @@ class DragDropListWidget(QListWidget):
 		self.config_game_path = config_game_path
 		self.current_game = current_game
 		self.enabled_dlls = self.read_dlls()
-		print('enabled dlls ',self.enabled_dlls)
+		tracer.debug('enabled dlls', dlls=self.enabled_dlls)
 		self.save_dict(self.enabled_dlls)
-		self.dlls_dict = self.read_dict()
-		print('dlls dict ',self.dlls_dict)
-		self.save_dlls()
+		self.dlls_dict = {}
 		self.setDragDropMode(QListWidget.DragDropMode.InternalMove)
-		self.populate()
 		self.itemChanged.connect(self.toggle_dll)
+		# Looking for DLLs walks the game folder, keep that off the GUI thread
+		self.scanner = Scanner(self)
+		self.scanner.finished.connect(self.load_dlls)
+		self.rescan()
+
+	def rescan(self):
+		self.scanner.start(self.get_dll_paths)
+
+	def load_dlls(self, dll_paths):
+		# Toggles since the pane was built are in the game config, not in
+		# the set read at startup
+		self.enabled_dlls = self.read_dlls()
+		self.dlls_dict = self.read_dict(dll_paths)
+		tracer.debug('dlls dict', dlls=self.dlls_dict)
+		self.save_dlls()
+		self.clear()
+		self.populate()
 
 	def populate(self):
 		for dll in self.dlls_dict.keys():
@@ -30,103 +45,61 @@ class DragDropListWidget(QListWidget):
 		super().dropEvent(event)
 		self.update_items()
 
+	@tracer.traced('dll.reorder')
 	def update_items(self):
 		new_order = []
 		for index in range(self.count()):
 			new_order.append(self.item(index).text())
 		self.dlls_dict = {key: self.dlls_dict[key] for key in new_order}
-		print('moved',self.dlls_dict)
+		tracer.debug('moved', dlls=self.dlls_dict)
 		self.save_dict(self.dlls_dict)
 		self.save_dlls()
 
+	@tracer.traced('dll.toggle')
 	def toggle_dll(self, item):
 		self.dlls_dict[item.text()] = True if item.checkState() == Qt.CheckState.Checked else False
-		print('toggled',self.dlls_dict)
+		tracer.debug('toggled', dlls=self.dlls_dict)
 		self.save_dict(self.dlls_dict)
 		self.save_dlls()
 
-	def read_dict(self):
+	def read_dict(self, dll_paths=None):
 		try:
-			with open('config.toml', 'r', encoding='utf-8' ) as toml_file:
-				config = toml.load(toml_file)
-			dll_list = config[self.current_game]['external_dlls']
-			dll_paths = self.get_dll_paths()
-			print('paths',dll_paths)
-			print('list',dll_list)
-
-			# creating a copy because according to copilot: 
-			# "The issue of skipping elements during iteration is likely due to 
-			# modifying the list (dll_list) while iterating over it"
-			dll_list_copy = dll_list[:]
-			for i in dll_list_copy:
-				# print('working on', i)
-				if i not in dll_paths:
-					# print('removing', i)
-					dll_list.remove(i)
-			
-			for i in dll_paths:
-				if i not in dll_list:
-					dll_list.append(i)
-
-			dll_dict = {}
-			for i in dll_list:
-				if i in self.enabled_dlls:
-					dll_dict[i] = True
-				else:
-					dll_dict[i] = False
-
-			
-			
-			return dll_dict
+			if dll_paths is None:
+				dll_paths = self.get_dll_paths()
+			tracer.debug('paths', dll_paths=dll_paths)
+			# Ordered merge: saved order first, newly found DLLs at the end
+			return read_dll_order(self.current_game, self.config_game_path, dll_paths, self.enabled_dlls)
 
 		except Exception as e:
-			print(f"Failed to read the TOML file: {e}")
+			tracer.warning(f"Failed to read the TOML file: {e}")
 			return {}
 
 	def save_dict(self, dict=None):
+		save_dll_list(self.current_game, dict.keys())
 
-		config = toml.load('config.toml')
-		config[self.current_game]['external_dlls'] = [key for key in dict.keys()]
-		with open('config.toml', 'w', encoding='utf-8') as toml_file:
-			toml.dump(config, toml_file)
-
-	def get_dll_paths(self):
-		dll_paths = []
-		dir = os.path.dirname(self.config_game_path)
-		for root, dirs, files in os.walk(dir):
-			dirs[:] = [d for d in dirs if d != 'modengine2']
-			for file in files:
-				if file.endswith('.dll'):
-					relative_path = os.path.relpath(os.path.join(root, file), dir)
-					relative_path = relative_path.replace('\\', '/')
-					dll_paths.append(relative_path)
-		return dll_paths
+	def get_dll_paths(self, token=None):
+		return get_dll_paths(self.current_game, self.config_game_path, token)
 
 	def read_dlls(self):
 		try:
-			with open(self.config_game_path, 'r') as toml_file:
-				data = toml.load(toml_file)
-				dll_list = data['modengine']['external_dlls']
-				dll_dict = {dll: True for dll in dll_list}
-				return dll_dict
+			return {dll: True for dll in read_enabled_dlls(self.config_game_path)}
 
 		except Exception as e:
-			print(f"Failed to read the TOML file: {e}")
+			tracer.warning(f"Failed to read the TOML file: {e}")
 
 	def save_dlls(self):
-		config_ME2 = toml.load(self.config_game_path)
-		config_ME2['modengine']['external_dlls'] = [key for key in self.dlls_dict.keys() if self.dlls_dict[key]]
-		with open(self.config_game_path, 'w') as toml_file:
-			toml.dump(config_ME2, toml_file)
+		save_enabled_dlls(self.config_game_path, self.dlls_dict)
 
 class dllOrganizer(QWidget):
 	def __init__(self, config_game_path, current_game):
 		super().__init__()
 		
 		self.layout = QVBoxLayout()
-		self.label = QLabel('Installed DLLs')
+		self.label = QLabel('Installed DLLs (scanning…)')
 		self.layout.addWidget(self.label)
 		self.list_widget = DragDropListWidget(config_game_path, current_game)
+		self.list_widget.scanner.finished.connect(lambda result: self.label.setText('Installed DLLs'))
+		self.list_widget.scanner.failed.connect(lambda error: self.label.setText('Installed DLLs'))
 		self.layout.addWidget(self.list_widget)
 		self.setLayout(self.layout)
 		self.list_widget.setStyleSheet("""QListWidget, QListWidget * {background-color: rgba(12, 12, 12, 0.75);
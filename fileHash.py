@@ -0,0 +1,86 @@
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from jsonFile import JsonCache
+from perfTrace import tracer
+
+# path to the on-disk hash cache, lives next to config.toml
+hash_cache_path = 'filehash.json'
+
+# Big enough to keep the disk busy, small enough to not matter for memory
+chunk_size = 1024 * 1024
+
+def hash_file(path):
+	digest = hashlib.blake2b(digest_size=20)
+	with open(path, 'rb') as file:
+		while True:
+			chunk = file.read(chunk_size)
+			if not chunk:
+				break
+			digest.update(chunk)
+	return digest.hexdigest()
+
+class HashCache(JsonCache):
+	# Remembers file hashes by (path, size, mtime) so a file is only read
+	# again after it changed on disk
+	def __init__(self, path=hash_cache_path):
+		super().__init__(path, 'the hash cache')
+		# self.data: Key: absolute file path, Value: [size, mtime, digest]
+		# hashlib drops the GIL while hashing, so threads hash in parallel
+		self.pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+
+	def hash_files(self, paths, token=None):
+		# Returns {path: digest}; files that can't be read are left out
+		self.load_once()
+		hashes = {}
+		pending = {}
+		for path in dict.fromkeys(paths):
+			try:
+				stat = os.stat(path)
+			except OSError:
+				continue
+			cached = self.data.get(path)
+			if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime:
+				hashes[path] = cached[2]
+			else:
+				pending[path] = (stat.st_size, stat.st_mtime, self.pool.submit(hash_file, path))
+		for path, (size, mtime, future) in pending.items():
+			# Files already being read still go into the cache
+			if token is not None and token.cancelled and future.cancel():
+				continue
+			try:
+				digest = future.result()
+			except OSError as e:
+				tracer.warning(f"Failed to hash {path}: {e}")
+				continue
+			hashes[path] = digest
+			with self.lock:
+				self.data[path] = [size, mtime, digest]
+				self.dirty = True
+		if token is not None:
+			token.check()
+		self.save()
+		return hashes
+
+	def identical(self, path_groups, token=None):
+		# path_groups: {key: [paths]}. Returns the keys whose files all have
+		# the same content. Files of different sizes are never read.
+		candidates = {}
+		for key, paths in path_groups.items():
+			try:
+				sizes = {os.path.getsize(path) for path in paths}
+			except OSError:
+				continue
+			if len(sizes) == 1:
+				candidates[key] = paths
+		with tracer.span('scan.hash', groups=len(candidates)):
+			hashes = self.hash_files([path for paths in candidates.values() for path in paths], token)
+		same = set()
+		for key, paths in candidates.items():
+			digests = {hashes.get(path) for path in paths}
+			if len(digests) == 1 and None not in digests:
+				same.add(key)
+		return same
+
+# Shared cache used by the conflict scans in app.py
+hash_cache = HashCache()
@@ -0,0 +1,81 @@
+import os
+from jsonFile import JsonCache
+from perfTrace import tracer
+
+# path to the on-disk index, lives next to config.toml
+index_path = 'fileindex.json'
+# Bumped when listings change meaning, version 2 leaves out links to folders
+index_version = 2
+
+class FileIndex(JsonCache):
+	# Caches the listing of every directory under a root together with the
+	# directory's mtime. Adding, removing or renaming an entry bumps the mtime
+	# of the directory that holds it, so a directory whose mtime didn't change
+	# can be served from the cache without listing it again.
+	def __init__(self, path=index_path):
+		super().__init__(path, 'the file index', index_version)
+		# self.data: Key: absolute directory path, Value: [mtime, [subdirs], [files]]
+
+	def listdir(self, path):
+		# Returns (subdirs, files) of path, only touching the disk for a stat
+		# unless the directory changed since the last scan
+		self.load_once()
+		try:
+			mtime = os.stat(path).st_mtime
+		except OSError:
+			self.forget(path)
+			return [], []
+		cached = self.data.get(path)
+		if cached is not None and cached[0] == mtime:
+			return cached[1], cached[2]
+
+		subdirs = []
+		files = []
+		try:
+			with os.scandir(path) as entries:
+				for entry in entries:
+					# Like os.walk, links to folders are never entered, so a
+					# link loop inside a mod can't be followed
+					if entry.is_dir(follow_symlinks=False):
+						subdirs.append(entry.name)
+					elif not (entry.is_symlink() and entry.is_dir()):
+						files.append(entry.name)
+		except OSError as e:
+			tracer.warning(f"Failed to list {path}: {e}")
+			return [], []
+		# Subfolders that disappeared take their cached listings with them
+		if cached is not None:
+			for name in set(cached[1]) - set(subdirs):
+				self.forget(os.path.join(path, name))
+		with self.lock:
+			self.data[path] = [mtime, subdirs, files]
+			self.dirty = True
+		return subdirs, files
+
+	def mtime(self, path):
+		# mtime the cached listing of path was taken at, None if not cached
+		cached = self.data.get(path)
+		return cached[0] if cached is not None else None
+
+	def forget(self, path):
+		# Drop a directory and everything below it from the index
+		self.load_once()
+		prefix = path.rstrip(os.sep) + os.sep
+		with self.lock:
+			stale = [key for key in self.data if key == path or key.startswith(prefix)]
+			for key in stale:
+				del self.data[key]
+			if stale:
+				self.dirty = True
+
+	def walk(self, top):
+		# Same contract as os.walk (top-down), so callers can prune by
+		# modifying dirs in place
+		subdirs, files = self.listdir(top)
+		dirs = list(subdirs)
+		yield top, dirs, list(files)
+		for name in dirs:
+			yield from self.walk(os.path.join(top, name))
+
+# Shared index used by the scans in app.py
+file_index = FileIndex()
@@ -1,26 +1,29 @@
 import sys
-import json
 import os
 from PyQt6.QtCore import QDir, Qt
-from PyQt6.QtGui import QFileSystemModel
-from PyQt6.QtWidgets import QStyledItemDelegate, QComboBox, QApplication, QTreeView, QWidget, QVBoxLayout, QLabel
+from PyQt6.QtGui import QFileSystemModel, QStandardItem, QStandardItemModel
+from PyQt6.QtWidgets import QStyledItemDelegate, QComboBox, QCompleter, QApplication, QTreeView, QWidget, QVBoxLayout, QLabel
+from itemCatalog import get_catalog
+from perfTrace import tracer
 
 
-def itemIDs():
-    if hasattr(sys, '_MEIPASS'):
-        # Running in a PyInstaller bundle
-        base_path = sys._MEIPASS
-    else:
-        # Running in a normal Python environment
-        base_path = os.path.abspath(".")
+# Key: (catalog id, slot prefix), Value: (catalog version, model). The same
+# model backs every part picker for that slot, so opening one is instant.
+slot_models = {}
 
-    dictPath = os.path.join(base_path, 'parts.json')
 
-    # Load key-value pairs from the JSON file
-    with open(dictPath, 'r') as file:
-        IDs = json.load(file)
-        print(IDs)
-    return IDs
+def slot_model(itemIDs, prefix):
+    key = (id(itemIDs), prefix[:2])
+    cached = slot_models.get(key)
+    if cached is not None and cached[0] == itemIDs.version:
+        return cached[1]
+    model = QStandardItemModel()
+    for description, file_name in itemIDs.sorted_slot(prefix):
+        item = QStandardItem(description)
+        item.setData(file_name, Qt.ItemDataRole.UserRole)
+        model.appendRow(item)
+    slot_models[key] = (itemIDs.version, model)
+    return model
 
 
 class ComboBoxDelegate(QStyledItemDelegate):
@@ -34,26 +37,30 @@ class ComboBoxDelegate(QStyledItemDelegate):
         self.currentFilePath = index.model().filePath(index)
         if original_filename in self.itemIDs:
             comboBox = QComboBox(parent)
-            comboBox.addItem(original_filename)
-            matchingIDs = [(id, self.itemIDs[id])
-                           for id in self.itemIDs.keys() if id[:2] == original_filename[:2]]
-            matchingIDs.sort(key=lambda x: x[1])
-            for id, description in matchingIDs:
-                comboBox.addItem(description, id)
+            comboBox.setModel(slot_model(self.itemIDs, original_filename))
+            # Type to search, matches anywhere in the item name
+            comboBox.setEditable(True)
+            comboBox.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+            comboBox.completer().setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
+            comboBox.completer().setFilterMode(Qt.MatchFlag.MatchContains)
+            comboBox.completer().setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+            comboBox.setCurrentIndex(comboBox.findData(original_filename))
             comboBox.currentIndexChanged.connect(self.renameFile)
             return comboBox
         return super().createEditor(parent, option, index)
 
     def setEditorData(self, editor, index):
         if isinstance(editor, QComboBox):
-            currentText = index.data()
-            editor.setCurrentText(currentText)
+            # The current part was picked in createEditor
+            pass
         else:
             super().setEditorData(editor, index)
 
     def setModelData(self, editor, model, index):
         if isinstance(editor, QComboBox):
-            model.setData(index, editor.currentText())
+            # renameFile already renamed the file when the pick changed, and
+            # the text is a description rather than a file name
+            pass
         else:
             super().setModelData(editor, model, index)
 
@@ -61,13 +68,16 @@ class ComboBoxDelegate(QStyledItemDelegate):
         comboBox = self.sender()
         # Retrieve the file name (key) from the data
         newFileName = comboBox.currentData()
+        if not newFileName:
+            return
         newFilePath = os.path.join(os.path.dirname(
             self.currentFilePath), newFileName)
         try:
-            os.rename(self.currentFilePath, newFilePath)
+            with tracer.span('file.rename', path=newFilePath):
+                os.rename(self.currentFilePath, newFilePath)
             self.currentFilePath = newFilePath
         except Exception as e:
-            print(f"Error renaming file: {e}")
+            tracer.error(f"Error renaming file: {e}")
 
 
 class EditableFileSystemModel(QFileSystemModel):
@@ -76,17 +86,36 @@ class EditableFileSystemModel(QFileSystemModel):
     def __init__(self, itemIDs, parent=None):
         super().__init__(parent)
         self.itemIDs = itemIDs
+        # Key: index.internalId(), Value: (file name, item description or
+        # None). Painting asks for both on every repaint, this way the path
+        # work happens once per file.
+        self.names = {}
+        # Node ids are only reused after their rows go away, so drop
+        # everything whenever the model's view of the disk changes
+        self.fileRenamed.connect(self.clearNames)
+        self.directoryLoaded.connect(self.clearNames)
+        self.rowsAboutToBeRemoved.connect(self.clearNames)
+        self.modelAboutToBeReset.connect(self.clearNames)
+
+    def clearNames(self, *args):
+        self.names.clear()
+
+    def displayName(self, index):
+        key = index.internalId()
+        cached = self.names.get(key)
+        if cached is None:
+            file_name = self.fileName(index)
+            cached = (file_name, self.itemIDs.get(file_name))
+            self.names[key] = cached
+        return cached
 
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
         if role == Qt.ItemDataRole.DisplayRole and index.column() == 0:
-            file_path = self.filePath(index)
-            file_name = os.path.basename(file_path)
-            if file_name in self.itemIDs:
-                return self.itemIDs[file_name]
+            description = self.displayName(index)[1]
+            if description is not None:
+                return description
         elif role == self.OriginalFileNameRole:
-            file_path = self.filePath(index)
-            file_name = os.path.basename(file_path)
-            return file_name
+            return self.displayName(index)[0]
         return super().data(index, role)
 
     def flags(self, index):
@@ -94,9 +123,18 @@ class EditableFileSystemModel(QFileSystemModel):
 
 
 class DirTreeView(QWidget):
-    def __init__(self, path, itemIDs={}):
+    def __init__(self, path, itemIDs={}, expand_depth=1, expand_paths=()):
         super().__init__()
         self.path = path
+        # Folders are only opened up to expand_depth levels, plus every
+        # folder on the way to one of expand_paths (files relative to path).
+        # Everything else is loaded when the user opens it.
+        self.expand_depth = expand_depth
+        self.expand_dirs = set()
+        for rel_path in expand_paths:
+            parts = rel_path.replace('\\', '/').lower().split('/')[:-1]
+            for i in range(1, len(parts) + 1):
+                self.expand_dirs.add('/'.join(parts[:i]))
         # Create a file system model
         self.model = EditableFileSystemModel(itemIDs)
         # Only display directories in the tree view by default
@@ -116,14 +154,32 @@ class DirTreeView(QWidget):
         self.tree_view.setSortingEnabled(True)
         self.tree_view.sortByColumn(0, Qt.SortOrder.AscendingOrder)
         self.tree_view.header().resizeSection(0, 450)
-        self.tree_view.expandAll()
+        # QFileSystemModel lists folders on a background thread, expand
+        # each one as its listing arrives
+        self.model.directoryLoaded.connect(self.autoExpand)
         delegate = ComboBoxDelegate(itemIDs)
         self.tree_view.setItemDelegateForColumn(0, delegate)
 
 
+    def autoExpand(self, directory):
+        rel_dir = os.path.relpath(directory, self.path).replace(os.sep, '/')
+        if rel_dir.startswith('..'):
+            return
+        depth = 0 if rel_dir == '.' else rel_dir.count('/') + 1
+        parent = self.model.index(directory)
+        for row in range(self.model.rowCount(parent)):
+            child = self.model.index(row, 0, parent)
+            if not self.model.isDir(child):
+                continue
+            name = self.model.fileName(child).lower()
+            rel_child = name if depth == 0 else rel_dir.lower() + '/' + name
+            if depth + 1 <= self.expand_depth or rel_child in self.expand_dirs:
+                self.tree_view.expand(child)
+
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
-    IDs = itemIDs()
+    IDs = get_catalog()
     # Create the directory tree view widget
     tree_view = DirTreeView(
         path="D:\\Games\\elden rang mods\\ModEngine-2.1.0.0-win64\\mod",
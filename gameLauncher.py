@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import hashlib
+from PyQt6.QtCore import QObject, QProcess, QTimer, pyqtSignal
+from jsonFile import load_json, save_json
+
+# Launch timings, kept next to config.toml
+stats_path = 'launch_stats.json'
+# Runs remembered per mod set
+keep_runs = 20
+
+def config_snapshot(config_data):
+	# Identifies the mod set a launch ran with: enabled mods and DLLs, in
+	# load order. Returns (snapshot id, {'mods': [...], 'dlls': [...]}).
+	try:
+		mods = [mod.get('name', mod.get('path')) for mod in config_data['extension']['mod_loader']['mods']
+				if mod.get('enabled', True)]
+	except (KeyError, TypeError):
+		mods = []
+	try:
+		dlls = list(config_data['modengine']['external_dlls'])
+	except (KeyError, TypeError):
+		dlls = []
+	snapshot = {'mods': mods, 'dlls': dlls}
+	digest = hashlib.sha1(json.dumps(snapshot).encode('utf-8')).hexdigest()[:12]
+	return digest, snapshot
+
+class LaunchStats:
+	# Key: snapshot id, Value: {'mods': [...], 'dlls': [...], 'runs': [timings]}
+	def __init__(self, path=stats_path):
+		self.path = path
+		self.snapshots = {}
+		self.load()
+
+	def load(self):
+		self.snapshots = load_json(self.path, 'launch stats', {})
+
+	def save(self):
+		save_json(self.path, self.snapshots, 'launch stats', indent=1)
+
+	def record(self, snapshot_id, snapshot, timings):
+		entry = self.snapshots.setdefault(snapshot_id, dict(snapshot, runs=[]))
+		entry['runs'] = (entry['runs'] + [timings])[-keep_runs:]
+		self.save()
+
+	def average(self, snapshot_id, key):
+		# Mean of one timing over the remembered runs of a mod set, or None
+		runs = self.snapshots.get(snapshot_id, {}).get('runs', [])
+		values = [run[key] for run in runs if run.get(key) is not None]
+		return sum(values) / len(values) if values else None
+
+class GameLauncher(QObject):
+	# Runs launchmod_<game>.bat without blocking the event loop. Timings
+	# are seconds since the click: spawn (process started), launcher_exit
+	# (the batch file returned) and session (the game process went away,
+	# or the launcher exit when we don't know the game's executable).
+	output = pyqtSignal(str)
+	started = pyqtSignal()
+	finished = pyqtSignal(dict)
+
+	def __init__(self, stats=None, poll_interval=5000, parent=None):
+		super().__init__(parent)
+		self.stats = stats or LaunchStats()
+		self.process = None
+		self.poll = None
+		self.poll_timer = QTimer(self)
+		self.poll_timer.setInterval(poll_interval)
+		self.poll_timer.timeout.connect(self.poll_game)
+
+	def running(self):
+		return self.process is not None
+
+	def launch(self, batch_file, cwd, snapshot, game_exe=None):
+		# snapshot: what config_snapshot returned for the config being launched
+		if self.running():
+			return False
+		self.snapshot_id, self.snapshot = snapshot
+		self.game_exe = game_exe
+		self.timings = {'date': time.strftime('%Y/%m/%d %H:%M:%S'), 'spawn': None,
+						'launcher_exit': None, 'session': None, 'exit_code': None}
+		self.process = QProcess(self)
+		self.process.setWorkingDirectory(cwd)
+		self.process.readyReadStandardOutput.connect(lambda: self.read(self.process.readAllStandardOutput()))
+		self.process.readyReadStandardError.connect(lambda: self.read(self.process.readAllStandardError()))
+		self.process.started.connect(self.on_started)
+		self.process.finished.connect(self.on_launcher_exit)
+		self.process.errorOccurred.connect(self.on_error)
+		self.t0 = time.perf_counter()
+		if os.name == 'nt':
+			self.process.start('cmd.exe', ['/c', batch_file])
+		else:
+			self.process.start('sh', [batch_file])
+		return True
+
+	def elapsed(self):
+		return round(time.perf_counter() - self.t0, 3)
+
+	def read(self, data):
+		text = bytes(data).decode('utf-8', errors='replace')
+		for line in text.splitlines():
+			self.output.emit(line)
+
+	def on_started(self):
+		self.timings['spawn'] = self.elapsed()
+		self.started.emit()
+
+	def on_error(self, error):
+		if error == QProcess.ProcessError.FailedToStart:
+			self.output.emit(f"Failed to start the launcher: {self.process.errorString()}")
+			self.finish()
+
+	def on_launcher_exit(self, exit_code, exit_status):
+		self.timings['launcher_exit'] = self.elapsed()
+		self.timings['exit_code'] = exit_code
+		self.output.emit(f"Launcher exited with code {exit_code} after {self.timings['launcher_exit']:.2f} s")
+		if self.game_exe:
+			self.poll_game()
+			self.poll_timer.start()
+		else:
+			self.finish()
+
+	def poll_game(self):
+		# Ask the OS whether the game is still running, without blocking
+		if self.poll is not None:
+			return
+		self.poll = QProcess(self)
+		self.poll.finished.connect(self.on_poll)
+		self.poll.errorOccurred.connect(lambda error: self.on_poll(-1, None))
+		if os.name == 'nt':
+			self.poll.start('tasklist', ['/NH', '/FI', f'IMAGENAME eq {self.game_exe}'])
+		else:
+			self.poll.start('pgrep', ['-x', self.game_exe])
+
+	def on_poll(self, exit_code, exit_status):
+		if self.poll is None:
+			return
+		text = bytes(self.poll.readAllStandardOutput()).decode('utf-8', errors='replace')
+		self.poll.deleteLater()
+		self.poll = None
+		if exit_code == -1:
+			alive = False
+		elif os.name == 'nt':
+			alive = self.game_exe.lower() in text.lower()
+		else:
+			alive = exit_code == 0
+		if not alive:
+			self.poll_timer.stop()
+			self.finish()
+
+	def finish(self):
+		if self.process is None:
+			return
+		self.timings['session'] = self.elapsed()
+		self.stats.record(self.snapshot_id, self.snapshot, self.timings)
+		self.process.deleteLater()
+		self.process = None
+		self.finished.emit(dict(self.timings, snapshot=self.snapshot_id))
@@ -0,0 +1,130 @@
+import os
+import re
+import sys
+import json
+import threading
+from collections.abc import Mapping
+from perfTrace import tracer
+
+# hd_m_1010.partsbnd.dcx -> slot 'hd', gender 'm', id 1010
+part_pattern = re.compile(r'^([a-z]{2})_([a-z])_(\d+)')
+
+def resource_path(name):
+	if hasattr(sys, '_MEIPASS'):
+		# Running in a PyInstaller bundle
+		base_path = sys._MEIPASS
+	else:
+		# Running in a normal Python environment
+		base_path = os.path.abspath(".")
+	return os.path.join(base_path, name)
+
+class ItemCatalog(Mapping):
+	# Part file name -> item description, read from parts.json the first
+	# time anything asks for it. Behaves like the dict itemIDs() used to
+	# return, plus lookups by slot prefix, gender and numeric ID.
+	def __init__(self, paths=()):
+		self.paths = list(paths)
+		self.lock = threading.Lock()
+		self.loaded = False
+		self.items = {}
+		self.by_slot = {}
+		self.by_gender = {}
+		self.by_id = {}
+		# Key: slot prefix, Value: [(description, file name)] sorted by description
+		self.sorted_slots = {}
+		# Bumped whenever more items are added, lets views drop stale copies
+		self.version = 0
+
+	def load(self):
+		if self.loaded:
+			return
+		with self.lock:
+			if self.loaded:
+				return
+			for path in self.paths:
+				self.read(path)
+			self.loaded = True
+
+	def add(self, path):
+		# Extra catalogs, e.g. per game, layered over what is already there
+		self.paths.append(path)
+		if self.loaded:
+			with self.lock:
+				self.read(path)
+				self.sorted_slots = {}
+				self.version += 1
+
+	def read(self, path):
+		try:
+			with open(path, 'r', encoding='utf-8') as file:
+				IDs = json.load(file)
+		except FileNotFoundError:
+			return
+		except Exception as e:
+			tracer.warning(f"Failed to read item catalog {path}: {e}")
+			return
+		for file_name, description in IDs.items():
+			if file_name not in self.items:
+				match = part_pattern.match(file_name)
+				if match:
+					slot, gender, number = match.groups()
+					self.by_slot.setdefault(slot, []).append(file_name)
+					self.by_gender.setdefault(gender, []).append(file_name)
+					self.by_id.setdefault(int(number), []).append(file_name)
+			self.items[file_name] = description
+
+	def __getitem__(self, file_name):
+		self.load()
+		return self.items[file_name]
+
+	def __contains__(self, file_name):
+		self.load()
+		return file_name in self.items
+
+	def __iter__(self):
+		self.load()
+		return iter(self.items)
+
+	def __len__(self):
+		self.load()
+		return len(self.items)
+
+	def slot(self, prefix):
+		# every part for a slot prefix like 'hd' (or 'hd_')
+		self.load()
+		return self.by_slot.get(prefix[:2], [])
+
+	def sorted_slot(self, prefix):
+		# What the part picker lists for a slot, sorted once and reused
+		self.load()
+		prefix = prefix[:2]
+		choices = self.sorted_slots.get(prefix)
+		if choices is None:
+			choices = sorted(((self.items[file_name], file_name) for file_name in self.by_slot.get(prefix, [])),
+							 key=lambda choice: choice[0])
+			self.sorted_slots[prefix] = choices
+		return choices
+
+	def gender(self, gender):
+		self.load()
+		return self.by_gender.get(gender, [])
+
+	def item_id(self, number):
+		self.load()
+		return self.by_id.get(int(number), [])
+
+# Key: game id, Value: its catalog. Shared by app.py and fileViewer.py.
+catalogs = {}
+catalogs_lock = threading.Lock()
+
+def get_catalog(game=None):
+	# parts.json, with parts_<game>.json layered on top when it exists
+	with catalogs_lock:
+		catalog = catalogs.get(game)
+		if catalog is None:
+			paths = [resource_path('parts.json')]
+			if game:
+				paths.append(resource_path(f'parts_{game}.json'))
+			catalog = ItemCatalog(paths)
+			catalogs[game] = catalog
+		return catalog
@@ -0,0 +1,70 @@
+import os
+import json
+import threading
+from perfTrace import tracer
+
+# The JSON files the app keeps next to config.toml (file index, hash cache,
+# launch stats, session cache, startup timeline) are all read and written
+# through here. Writes go to a temp file that then replaces the old one, so
+# a crash mid-write never leaves half a file behind.
+
+def load_json(path, what, default=None):
+	# Contents of path, default if it's missing or can't be parsed
+	try:
+		with open(path, 'r', encoding='utf-8') as json_file:
+			return json.load(json_file)
+	except FileNotFoundError:
+		return default
+	except Exception as e:
+		tracer.warning(f"Failed to read {what}: {e}")
+		return default
+
+def write_text(path, text, what):
+	try:
+		tmp_path = path + '.tmp'
+		with open(tmp_path, 'w', encoding='utf-8') as json_file:
+			json_file.write(text)
+		os.replace(tmp_path, path)
+	except OSError as e:
+		tracer.warning(f"Failed to write {what}: {e}")
+
+def save_json(path, data, what, indent=None):
+	write_text(path, json.dumps(data, indent=indent), what)
+
+class JsonCache:
+	# A dict that other threads add to, read from disk the first time it's
+	# needed and written back only after it changed
+	def __init__(self, path, what, version=None):
+		self.path = path
+		self.what = what
+		# Files written with another version are dropped on load, for when
+		# what the entries mean changes
+		self.version = version
+		self.lock = threading.Lock()
+		self.dirty = False
+		self.data = {}
+		# Read from disk the first time something needs it
+		self.loaded = False
+
+	def load(self):
+		data = load_json(self.path, self.what, {})
+		if self.version is not None:
+			data = data.get('data') if isinstance(data, dict) and data.get('version') == self.version else {}
+		self.data = data if isinstance(data, dict) else {}
+
+	def load_once(self):
+		if self.loaded:
+			return
+		with self.lock:
+			if not self.loaded:
+				self.load()
+				self.loaded = True
+
+	def save(self):
+		# Serialized under the lock, written outside it
+		with self.lock:
+			if not self.dirty:
+				return
+			text = json.dumps(self.data if self.version is None else {'version': self.version, 'data': self.data})
+			self.dirty = False
+		write_text(self.path, text, self.what)
@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import argparse
+import contextlib
+from configStore import config_store
+from modCore import (config_path, resolve_game, read_mod_folder_path, read_mod_folders, read_mods, apply_mod_states,
+					 build_conflict_index, mod_load_order, get_dll_paths, read_dll_order, save_dll_list, save_enabled_dlls)
+
+# Command line front end for scripting mod setups, no Qt involved:
+#   python meo.py list
+#   python meo.py enable ModA ModB
+#   python meo.py conflicts --hash
+#   python meo.py dll-order --set b.dll a.dll --disable a.dll
+# Everything is printed as JSON on stdout, diagnostics go to stderr.
+
+def list_mods(game, config_game_path, args):
+	root_mods_path = read_mod_folder_path(config_game_path)
+	folders = dict(read_mod_folders(root_mods_path))
+	rows = []
+	for mod in read_mods(config_game_path):
+		name = mod['name']
+		rows.append({'name': name, 'enabled': bool(mod.get('enabled')), 'path': mod.get('path'),
+					 'registered': True, 'installed': name in folders or mod.get('path') == os.path.basename(root_mods_path),
+					 'date': folders.pop(name, None)})
+	# Folders ModEngine2 doesn't know about yet
+	for name, date in sorted(folders.items()):
+		rows.append({'name': name, 'enabled': False, 'path': None,
+					 'registered': False, 'installed': True, 'date': date})
+	return rows
+
+def set_enabled(enabled):
+	def command(game, config_game_path, args):
+		known = {mod['name'] for mod in read_mods(config_game_path)}
+		changed = apply_mod_states(config_game_path, {name: enabled for name in args.mods if name in known})
+		return {'changed': changed, 'unknown': [name for name in args.mods if name not in known]}
+	return command
+
+def conflicts(game, config_game_path, args):
+	mods = read_mods(config_game_path)
+	disabled_mods = [mod['name'] for mod in mods if not mod['enabled']]
+	conflict_index = build_conflict_index(config_game_path, disabled_mods, mod_load_order(mods),
+										  hash_duplicates=args.hash)
+	result = {'order': conflict_index.order, 'conflicts': conflict_index.conflicts()}
+	if args.hash:
+		result['duplicates'] = conflict_index.duplicates()
+	return result
+
+def dll_order(game, config_game_path, args):
+	dlls = read_dll_order(game, config_game_path, get_dll_paths(game, config_game_path, config_path=args.config),
+						  config_path=args.config)
+	unknown = [dll for dll in args.set + args.enable + args.disable if dll not in dlls]
+	if args.set:
+		# Listed DLLs go first in the given order, the rest keep theirs
+		listed = [dll for dll in dict.fromkeys(args.set) if dll in dlls]
+		dlls = {dll: dlls[dll] for dll in listed + [dll for dll in dlls if dll not in listed]}
+	for dll in args.enable:
+		if dll in dlls:
+			dlls[dll] = True
+	for dll in args.disable:
+		if dll in dlls:
+			dlls[dll] = False
+	# Without flags this only shows the order
+	if args.set or args.enable or args.disable:
+		save_dll_list(game, dlls.keys(), config_path=args.config)
+		save_enabled_dlls(config_game_path, dlls)
+	result = {'dlls': [{'dll': dll, 'enabled': enabled} for dll, enabled in dlls.items()]}
+	if unknown:
+		result['unknown'] = unknown
+	return result
+
+def parser():
+	parser = argparse.ArgumentParser(prog='meo', description='Manage ModEngine2 mods without the GUI.')
+	parser.add_argument('--config', default=config_path, help='path to config.toml (default: %(default)s)')
+	parser.add_argument('--game', help='game entry in config.toml (default: current_game)')
+	commands = parser.add_subparsers(dest='command', required=True)
+	commands.add_parser('list', help='list mods and whether they are enabled').set_defaults(run=list_mods)
+	for name, enabled in (('enable', True), ('disable', False)):
+		command = commands.add_parser(name, help=f'{name} mods by name')
+		command.add_argument('mods', nargs='+')
+		command.set_defaults(run=set_enabled(enabled))
+	command = commands.add_parser('conflicts', help='files shipped by more than one enabled mod')
+	command.add_argument('--hash', action='store_true', help='leave out byte-identical copies')
+	command.set_defaults(run=conflicts)
+	command = commands.add_parser('dll-order', help='show or change the external DLL order')
+	command.add_argument('--set', nargs='+', default=[], metavar='DLL', help='move these DLLs to the front, in order')
+	command.add_argument('--enable', action='append', default=[], metavar='DLL')
+	command.add_argument('--disable', action='append', default=[], metavar='DLL')
+	command.set_defaults(run=dll_order)
+	return parser
+
+def main(argv=None):
+	args = parser().parse_args(argv)
+	stdout = sys.stdout
+	try:
+		# Diagnostics go to stderr through perfTrace, keep anything else printed
+		# off stdout too so it stays clean JSON
+		with contextlib.redirect_stdout(sys.stderr):
+			game, config_game_path = resolve_game(config_store.load(args.config), args.game)
+			result = args.run(game, config_game_path, args)
+			config_store.flush()
+	except Exception as e:
+		json.dump({'error': str(e)}, stdout)
+		stdout.write('\n')
+		return 1
+	json.dump(result, stdout, indent=2)
+	stdout.write('\n')
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,258 @@
+import os
+import copy
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from fileIndex import file_index
+from conflictIndex import ConflictIndex
+from fileHash import hash_cache
+from configStore import config_store
+from dllDiscovery import find_dlls, reconcile, default_include, default_exclude
+from modTrash import trash_dir_name
+from perfTrace import tracer
+
+# Everything here works without Qt, app.py, dllOrganizer.py and the meo
+# command line tool all build on it
+
+# path to TOML config file that contains path to config_eldenring.toml
+config_path = 'config.toml'
+
+# Prefix of the folder an archive is unpacked into before it gets its name
+staging_prefix = '.import-'
+
+# Folders in the mod root that belong to the game rather than to a mod
+game_folders = ['chr','parts','sfx','menu']
+
+# Per-mod scans are mostly waiting on the disk, so use more threads than cores
+scan_pool = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+
+def is_mod_folder(name):
+	# The trash and half-imported archives live in the mod root too
+	return name != trash_dir_name and not name.startswith(staging_prefix)
+
+# Key: mod folder path, Value: (mtime of every folder in it, file list) as
+# of the last scan. The list is handed out again while no folder changed.
+mod_file_cache = {}
+# Inputs and result of the last build_conflict_index, reused as long as
+# nothing it was built from changed
+last_conflict_index = [None, None, None]
+conflict_index_lock = threading.Lock()
+
+def scan_mod_files(mod_path, token=None):
+	# Lists every file of one mod relative to the mod's own folder
+	listings = []
+	for root, dirs, files in file_index.walk(mod_path):
+		# Bail out if a newer scan replaced this one
+		if token is not None:
+			token.check()
+		listings.append((root, file_index.mtime(root), files))
+	signature = tuple((root, mtime) for root, mtime, files in listings)
+	cached = mod_file_cache.get(mod_path)
+	if cached is not None and cached[0] == signature:
+		return cached[1]
+	mod_files = []
+	for root, mtime, files in listings:
+		rel_dir = os.path.relpath(root, mod_path)
+		for file in files:
+			mod_files.append(os.path.normpath(os.path.join(rel_dir, file)))
+	mod_file_cache[mod_path] = (signature, mod_files)
+	return mod_files
+
+def mod_load_order(mods):
+	# Folder names in the order of the mods array, the first one wins
+	return [os.path.basename(mod.get('path', mod['name']).rstrip('/\\')) or mod['name'] for mod in mods]
+
+@tracer.traced('scan.conflicts')
+def build_conflict_index(config_game_path, disabled_mods, load_order=(), token=None, hash_duplicates=False):
+	# Convert list to set for faster lookup
+	disabled_mods_set = set(disabled_mods)
+	# Extract the directory of the config_game_path
+	directory = os.path.dirname(config_game_path)
+
+	# Construct the path to the 'mod' folder
+	mod_folder_path = os.path.join(directory, 'mod')
+	root_name = os.path.basename(mod_folder_path)
+
+	# Disabled mods are dropped by name before anything below them is read,
+	# every enabled mod is then scanned as its own task. Game folders and
+	# loose files in the root belong to the root folder's own mod entry.
+	mod_names, root_files = file_index.listdir(mod_folder_path)
+	scans = {}
+	root_scans = []
+	for name in mod_names:
+		if not is_mod_folder(name):
+			continue
+		if name in game_folders:
+			if root_name not in disabled_mods_set:
+				root_scans.append((name, scan_pool.submit(scan_mod_files, os.path.join(mod_folder_path, name), token)))
+		elif name not in disabled_mods_set:
+			scans[name] = scan_pool.submit(scan_mod_files, os.path.join(mod_folder_path, name), token)
+
+	mod_files = {name: scan.result() for name, scan in scans.items()}
+	root_results = [(folder, scan.result()) for folder, scan in root_scans]
+	file_index.save()
+
+	# Unchanged folders hand back the very same lists, so identity tells
+	# whether the last index still holds. The lists are kept alive with it
+	# so their ids can't be reused by new ones.
+	sources = [root_files] + list(mod_files.values()) + [files for folder, files in root_results]
+	inputs = (mod_folder_path, tuple(load_order), disabled_mods_set, hash_duplicates, list(mod_files),
+			  [folder for folder, files in root_results], [id(files) for files in sources])
+	# The library and conflict scanners can both be in here, so the last
+	# index is read and replaced in one step each
+	with conflict_index_lock:
+		last_inputs, last_index, last_sources = last_conflict_index
+	reused = last_inputs == inputs
+	if reused:
+		conflict_index = last_index
+	else:
+		if root_name not in disabled_mods_set and (root_files or root_results):
+			root_mod_files = list(root_files)
+			for folder, files in root_results:
+				root_mod_files.extend(os.path.join(folder, path) for path in files)
+			mod_files[root_name] = root_mod_files
+		conflict_index = ConflictIndex(mod_files, load_order)
+	if hash_duplicates:
+		# Only files that actually collide get hashed. Contents can change
+		# without their folder changing, so this runs even on a reused index.
+		groups = {}
+		for key, providers in conflict_index.contested_paths().items():
+			groups[key] = [os.path.join(mod_folder_path, name if name != root_name else '', path) for name, path in providers]
+		identical = hash_cache.identical(groups, token)
+		if identical != conflict_index.identical:
+			if reused:
+				# Already handed out, don't change it under its users
+				conflict_index = copy.copy(conflict_index)
+			conflict_index.set_identical(identical)
+	# Only finished indexes are shared
+	with conflict_index_lock:
+		last_conflict_index[:] = [inputs, conflict_index, sources]
+	return conflict_index
+
+def conflictDetector(config_game_path, disabled_mods, token=None):
+	# Conflicts are files that more than one enabled mod ships under the same relative path
+	return build_conflict_index(config_game_path, disabled_mods, token=token).conflicts()
+
+def game_id(config_game_path):
+	# config_eldenring.toml -> eldenring
+	return os.path.basename(config_game_path)[7:-5]
+
+def read_mod_folder_path(config_game_path):
+	# Extract the directory of the config_game_path
+	directory = os.path.dirname(config_game_path)
+	try:
+		data = config_store.load(config_game_path)
+		# Construct the path to the 'mod' folder
+		return os.path.join(directory, data['extension']['mod_loader']['mods'][0]['path'])
+	except Exception as e:
+		tracer.warning(f"Failed to read the mod path from the TOML file: {e}")
+		return os.path.join(directory, 'mod')
+
+@tracer.traced('scan.folders')
+def read_mod_folders(mod_folder_path):
+	
+	# Check if the 'mod' folder exists
+	if not os.path.exists(mod_folder_path):
+		tracer.warning(f"The 'mod' folder does not exist at {mod_folder_path}")
+		return []
+	folders=[]
+	# List all folders in the 'mod' folder
+	for name in os.listdir(mod_folder_path):
+		folder_path = os.path.join(mod_folder_path, name)
+		if is_mod_folder(name) and os.path.isdir(folder_path):
+			# Get the 'date modified' timestamp 
+			date_modified_timestamp = os.path.getmtime(folder_path)
+			date_modified = datetime.fromtimestamp(
+				date_modified_timestamp).strftime('%Y/%m/%d %H:%M')
+			folders.append((name, date_modified))
+	return folders
+
+def read_mods(config_game_path):
+	try:
+		# Open and parse the TOML file
+		data = config_store.load(config_game_path)
+
+		# Extract the 'mods' section
+		mods = data['extension']['mod_loader']['mods']
+		return mods
+	except FileNotFoundError:
+		tracer.warning(f"File not found: {config_game_path}")
+		return []
+	except Exception as e:
+		tracer.warning(f"An error occurred: {e}")
+		return []
+
+def resolve_game(config, game=None):
+	# (game name, path of its config_<game>.toml) for the requested game,
+	# else current_game, else the first game that has a path
+	if game is None:
+		game = config.get('current_game')
+	if game and isinstance(config.get(game), dict) and config[game].get('path'):
+		return game, config[game]['path']
+	if game and game != config.get('current_game'):
+		raise ValueError(f"Unknown game: {game}")
+	for name, value in config.items():
+		if isinstance(value, dict) and value.get('path'):
+			return name, value['path']
+	raise ValueError('No game configured')
+
+def apply_mod_states(config_game_path, states, mods=None):
+	# states: {mod name: enabled}. Returns the names that changed, all of
+	# them are written with a single config commit.
+	if mods is None:
+		mods = read_mods(config_game_path)
+	changed = []
+	for mod in mods:
+		if mod['name'] in states and mod['enabled'] != bool(states[mod['name']]):
+			mod['enabled'] = bool(states[mod['name']])
+			changed.append(mod['name'])
+	if changed:
+		data = config_store.load(config_game_path)
+		data['extension']['mod_loader']['mods'] = mods
+		config_store.commit(config_game_path, ['extension.mod_loader.mods'])
+	return changed
+
+def read_enabled_dlls(config_game_path):
+	# DLLs ModEngine2 loads, in load order
+	data = config_store.load(config_game_path)
+	return list(data['modengine']['external_dlls'])
+
+def read_dll_order(current_game, config_game_path, dll_paths, enabled=None, config_path=config_path):
+	# {dll: enabled} in the order the organizer shows them: the saved order
+	# for DLLs still on disk, new ones at the end
+	config = config_store.load(config_path)
+	dll_list = config[current_game].setdefault('external_dlls', [])
+	if enabled is None:
+		enabled = read_enabled_dlls(config_game_path)
+	# ModEngine2's own list decides the order of the enabled DLLs, the same
+	# way the organizer seeds it, so a change to one DLL doesn't reorder others
+	enabled = list(enabled)
+	dll_list[:] = reconcile(enabled + dll_list, dll_paths)
+	enabled = set(enabled)
+	return {dll: dll in enabled for dll in dll_list}
+
+def save_dll_list(current_game, dlls, config_path=config_path):
+	# Order of every known DLL, enabled or not, lives in config.toml
+	config = config_store.load(config_path)
+	config[current_game]['external_dlls'] = list(dlls)
+	config_store.commit(config_path)
+
+def save_enabled_dlls(config_game_path, dlls_dict):
+	config_ME2 = config_store.load(config_game_path)
+	config_ME2['modengine']['external_dlls'] = [key for key in dlls_dict.keys() if dlls_dict[key]]
+	config_store.commit(config_game_path, ['modengine.external_dlls'])
+
+def dll_roots(current_game, config_path=config_path):
+	# Where to look for DLLs, relative to the folder of config_<game>.toml
+	try:
+		game_config = config_store.load(config_path)[current_game]
+		return (game_config.get('dll_include_roots', default_include),
+				game_config.get('dll_exclude_roots', default_exclude))
+	except Exception as e:
+		tracer.warning(f"Failed to read the TOML file: {e}")
+		return default_include, default_exclude
+
+@tracer.traced('scan.dlls')
+def get_dll_paths(current_game, config_game_path, token=None, config_path=config_path):
+	include, exclude = dll_roots(current_game, config_path)
+	return find_dlls(os.path.dirname(config_game_path), include, exclude, token)
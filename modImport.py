@@ -0,0 +1,157 @@
+import os
+import shutil
+import zipfile
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from conflictIndex import normalize_path
+from modCore import staging_prefix
+from dllDiscovery import asset_folders
+from perfTrace import tracer
+
+# .7z support is optional, py7zr is only imported once a .7z is opened
+has_7z = importlib.util.find_spec('py7zr') is not None
+
+# Size of the pieces files are copied in, memory use is workers * chunk_size
+chunk_size = 1024 * 1024
+
+def archive_filter():
+	# For the file dialog
+	return 'Mod Archives (*.zip *.7z)' if has_7z else 'Mod Archives (*.zip)'
+
+def list_members(archive_path):
+	# [(member name, size)] for every file in the archive
+	if archive_path.lower().endswith('.7z'):
+		if not has_7z:
+			raise RuntimeError('Importing .7z archives needs the py7zr package')
+		import py7zr
+		with py7zr.SevenZipFile(archive_path, 'r') as archive:
+			return [(info.filename, info.uncompressed or 0) for info in archive.list() if not info.is_directory]
+	with zipfile.ZipFile(archive_path) as archive:
+		return [(info.filename, info.file_size) for info in archive.infolist() if not info.is_dir()]
+
+def safe_path(name):
+	# Member name as a relative path, None for anything that would land
+	# outside the mod folder
+	parts = [part for part in name.replace('\\', '/').split('/') if part not in ('', '.')]
+	if not parts or '..' in parts or ':' in parts[0]:
+		return None
+	return '/'.join(parts)
+
+class ImportPlan:
+	# What importing an archive would do, worked out before anything is written
+	def __init__(self, archive_path, root_mods_path, config_game_path, conflict_index=None):
+		self.archive_path = archive_path
+		self.root_mods_path = root_mods_path
+		# The config the new mod is registered in, even if another game is
+		# current by the time extraction is done
+		self.config_game_path = config_game_path
+		members = []
+		for name, size in list_members(archive_path):
+			path = safe_path(name)
+			if path is None:
+				tracer.warning(f"Skipping unsafe archive member: {name}")
+				continue
+			members.append((name, path, size))
+		# A single top-level folder that isn't a game folder is the mod
+		# folder itself, otherwise the archive's name becomes the mod name
+		tops = {path.split('/', 1)[0] for name, path, size in members}
+		nested = len(tops) == 1 and all('/' in path for name, path, size in members)
+		top = next(iter(tops)) if nested else None
+		if top is not None and top.lower() not in asset_folders:
+			self.mod_name = top
+			# (member name, path relative to the mod folder, size)
+			self.members = [(name, path.split('/', 1)[1], size) for name, path, size in members]
+		else:
+			self.mod_name = os.path.splitext(os.path.basename(archive_path))[0]
+			self.members = members
+		self.total_size = sum(size for name, path, size in self.members)
+		# Key: mod already installed, Value: paths of the new mod it also ships
+		self.overlaps = {}
+		if conflict_index is not None:
+			for name, path, size in self.members:
+				for provider in conflict_index.providers.get(normalize_path(path), ()):
+					self.overlaps.setdefault(provider, []).append(path)
+
+	def target(self):
+		return os.path.join(self.root_mods_path, self.mod_name)
+
+def copy_member(open_member, path, staging, progress):
+	target = os.path.join(staging, *path.split('/'))
+	os.makedirs(os.path.dirname(target), exist_ok=True)
+	with open_member() as source, open(target, 'wb') as dest:
+		while True:
+			chunk = source.read(chunk_size)
+			if not chunk:
+				break
+			dest.write(chunk)
+			progress(len(chunk))
+
+def extract(plan, token=None, workers=4):
+	# Unpacks the archive into a staging folder next to the other mods and
+	# renames it into place once everything is written, so a failed or
+	# cancelled import never leaves half a mod behind
+	target = plan.target()
+	if os.path.exists(target):
+		raise FileExistsError(f"{target} already exists")
+	staging = os.path.join(plan.root_mods_path, staging_prefix + plan.mod_name)
+	shutil.rmtree(staging, ignore_errors=True)
+	os.makedirs(staging)
+	lock = threading.Lock()
+	done = [0]
+
+	def progress(size):
+		with lock:
+			done[0] += size
+			total = done[0]
+		if token is not None:
+			token.report(total, plan.total_size)
+
+	try:
+		if plan.archive_path.lower().endswith('.7z'):
+			extract_7z(plan, staging, token)
+		else:
+			extract_zip(plan, staging, token, workers, progress)
+		if token is not None:
+			token.check()
+		os.rename(staging, target)
+	except BaseException:
+		shutil.rmtree(staging, ignore_errors=True)
+		raise
+	return plan
+
+def extract_zip(plan, staging, token, workers, progress):
+	# Every worker reads through its own handle, a ZipFile can't be shared
+	# between threads. Members are dealt out biggest first so the workers
+	# finish at about the same time.
+	members = sorted(plan.members, key=lambda member: member[2], reverse=True)
+	batches = [members[i::workers] for i in range(workers)]
+
+	def run(batch):
+		with zipfile.ZipFile(plan.archive_path) as archive:
+			for name, path, size in batch:
+				if token is not None:
+					token.check()
+				copy_member(lambda: archive.open(name), path, staging, progress)
+
+	with ThreadPoolExecutor(max_workers=workers) as pool:
+		for future in [pool.submit(run, batch) for batch in batches if batch]:
+			future.result()
+
+def extract_7z(plan, staging, token):
+	# Solid 7z blocks can only be decoded front to back, so there's nothing
+	# to split between threads; py7zr streams them to disk
+	names = {name: path for name, path, size in plan.members}
+	unpacked = os.path.join(staging, '.7z')
+	import py7zr
+	with py7zr.SevenZipFile(plan.archive_path, 'r') as archive:
+		archive.extract(path=unpacked, targets=list(names))
+	for count, (name, path) in enumerate(names.items(), 1):
+		if token is not None:
+			token.check()
+		target = os.path.join(staging, *path.split('/'))
+		os.makedirs(os.path.dirname(target), exist_ok=True)
+		os.replace(os.path.join(unpacked, *name.replace('\\', '/').split('/')), target)
+		if token is not None:
+			token.report(count, len(names))
+	shutil.rmtree(unpacked, ignore_errors=True)
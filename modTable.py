@@ -0,0 +1,193 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, pyqtSignal
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QTableView, QAbstractItemView
+
+# Row backgrounds for the conflict states reported by the conflict index
+state_colors = {
+	'conflict': QColor(150, 0, 50, 120),
+	# Only shares byte-identical files with other mods
+	'duplicate': QColor(60, 90, 150, 120),
+}
+
+class ModTableModel(QAbstractTableModel):
+	# Emitted when the user ticks or unticks a mod: (mod name, enabled)
+	toggled = pyqtSignal(str, bool)
+
+	headers = ["", "Name", "Date Modified"]
+
+	def __init__(self, parent=None):
+		super().__init__(parent)
+		# Each row is [name, date modified, enabled, conflict state]
+		self.rows = []
+		# Key: mod name, Value: row number
+		self.positions = {}
+
+	def rowCount(self, parent=QModelIndex()):
+		return 0 if parent.isValid() else len(self.rows)
+
+	def columnCount(self, parent=QModelIndex()):
+		return 0 if parent.isValid() else len(self.headers)
+
+	def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+		if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+			return self.headers[section]
+		return super().headerData(section, orientation, role)
+
+	def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+		if not index.isValid():
+			return None
+		name, date, enabled, state = self.rows[index.row()]
+		column = index.column()
+		if role == Qt.ItemDataRole.CheckStateRole and column == 0:
+			return Qt.CheckState.Checked if enabled else Qt.CheckState.Unchecked
+		if role == Qt.ItemDataRole.DisplayRole:
+			if column == 1:
+				return name
+			if column == 2:
+				return date
+		elif role == Qt.ItemDataRole.BackgroundRole and column > 0:
+			return state_colors.get(state)
+		elif role == Qt.ItemDataRole.UserRole:
+			# Lets the proxy sort the checkbox column too
+			return (enabled, name) if column == 0 else (name if column == 1 else date)
+		return None
+
+	def flags(self, index):
+		flags = super().flags(index)
+		if index.column() == 0:
+			flags |= Qt.ItemFlag.ItemIsUserCheckable
+		return flags
+
+	def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+		if role != Qt.ItemDataRole.CheckStateRole or index.column() != 0:
+			return False
+		row = self.rows[index.row()]
+		row[2] = Qt.CheckState(value) == Qt.CheckState.Checked
+		self.dataChanged.emit(index, index, [role])
+		self.toggled.emit(row[0], row[2])
+		return True
+
+	def name(self, row):
+		return self.rows[row][0]
+
+	def names(self):
+		return [row[0] for row in self.rows]
+
+	def row_of(self, name):
+		return self.positions.get(name, -1)
+
+	def set_rows(self, rows):
+		self.beginResetModel()
+		self.rows = [list(row) for row in rows]
+		self.reindex()
+		self.endResetModel()
+
+	def update_rows(self, rows):
+		# Diff against what is shown, keyed by mod name: rows that went away
+		# are removed, changed rows repainted and new ones appended. Rows that
+		# didn't change aren't touched at all.
+		fresh = {row[0]: list(row) for row in rows}
+		position = len(self.rows) - 1
+		while position >= 0:
+			if self.rows[position][0] in fresh:
+				position -= 1
+				continue
+			# remove the whole run of stale rows in one go
+			last = position
+			while position > 0 and self.rows[position - 1][0] not in fresh:
+				position -= 1
+			self.beginRemoveRows(QModelIndex(), position, last)
+			del self.rows[position:last + 1]
+			self.endRemoveRows()
+			position -= 1
+		self.reindex()
+		for position, row in enumerate(self.rows):
+			new_row = fresh[row[0]]
+			if new_row != row:
+				self.rows[position] = new_row
+				self.changed(position, 0, len(self.headers) - 1)
+		added = [row for name, row in fresh.items() if name not in self.positions]
+		if added:
+			first = len(self.rows)
+			self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+			self.rows.extend(added)
+			self.endInsertRows()
+			self.reindex()
+
+	def reindex(self):
+		self.positions = {row[0]: i for i, row in enumerate(self.rows)}
+
+	def add_row(self, row):
+		position = len(self.rows)
+		self.beginInsertRows(QModelIndex(), position, position)
+		self.rows.append(list(row))
+		self.positions[row[0]] = position
+		self.endInsertRows()
+
+	def remove_row(self, name):
+		position = self.row_of(name)
+		if position == -1:
+			return
+		self.beginRemoveRows(QModelIndex(), position, position)
+		del self.rows[position]
+		self.reindex()
+		self.endRemoveRows()
+
+	def rename_row(self, name, new_name):
+		position = self.row_of(name)
+		if position == -1:
+			return
+		self.rows[position][0] = new_name
+		self.reindex()
+		self.changed(position, 1, 1)
+
+	def set_enabled(self, enabled):
+		# enabled: {mod name: bool}, only rows that differ are repainted
+		for position, row in enumerate(self.rows):
+			if row[0] in enabled and row[2] != enabled[row[0]]:
+				row[2] = enabled[row[0]]
+				self.changed(position, 0, 0)
+
+	def set_states(self, states):
+		# states: {mod name: conflict state}, missing names have no conflicts
+		for position, row in enumerate(self.rows):
+			state = states.get(row[0])
+			if row[3] != state:
+				row[3] = state
+				self.changed(position, 1, 2)
+
+	def changed(self, position, first, last):
+		self.dataChanged.emit(self.index(position, first), self.index(position, last))
+
+class ModTableView(QTableView):
+	def __init__(self, deleteModFunc, parent=None):
+		super().__init__(parent)
+		self.deleteModFunc = deleteModFunc
+		self.mod_model = ModTableModel(self)
+		self.proxy = QSortFilterProxyModel(self)
+		self.proxy.setSourceModel(self.mod_model)
+		self.proxy.setSortRole(Qt.ItemDataRole.UserRole)
+		self.setModel(self.proxy)
+		# Ctrl/Shift-click several mods for the bulk actions in the context menu
+		self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+		self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+		# All rows have the same height, so the view doesn't have to measure them
+		self.verticalHeader().setSectionResizeMode(self.verticalHeader().ResizeMode.Fixed)
+
+	def keyPressEvent(self, event):
+		if event.key() == Qt.Key.Key_Delete:
+			self.deleteModFunc()
+		else:
+			super().keyPressEvent(event)
+
+	def source_row(self, index):
+		return self.proxy.mapToSource(index).row()
+
+	def current_mod_name(self):
+		index = self.currentIndex()
+		if not index.isValid():
+			return None
+		return self.mod_model.name(self.source_row(index))
+
+	def selected_mod_names(self):
+		return [self.mod_model.name(self.source_row(index)) for index in self.selectionModel().selectedRows()]
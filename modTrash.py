@@ -0,0 +1,109 @@
+import os
+import time
+from perfTrace import tracer
+
+# Deleted mods are first renamed into this folder inside the mod root. That
+# is a single rename on the same drive, so it is instant however big the
+# mod is; the files are removed later on a worker thread.
+trash_dir_name = '.trash'
+# Suffix of a trash entry that is being removed and can't be restored anymore
+purging_suffix = '.purging'
+
+def trash_path(root_mods_path):
+	return os.path.join(root_mods_path, trash_dir_name)
+
+def move_to_trash(root_mods_path, mod_name):
+	# Returns the entry name the mod got inside the trash folder
+	trash = trash_path(root_mods_path)
+	os.makedirs(trash, exist_ok=True)
+	entry = f"{mod_name}.{time.time_ns()}"
+	os.rename(os.path.join(root_mods_path, mod_name), os.path.join(trash, entry))
+	return entry
+
+def restore(root_mods_path, entry, mod_name):
+	# Moves a trash entry back to its mod folder. Raises if it is already
+	# being purged or the name was taken in the meantime.
+	target = os.path.join(root_mods_path, mod_name)
+	if os.path.exists(target):
+		raise FileExistsError(f"{target} already exists")
+	os.rename(os.path.join(trash_path(root_mods_path), entry), target)
+
+def is_link(path):
+	# Symlinks and, on Windows, junctions. Only the link itself is ever
+	# removed, never what it points to.
+	return os.path.islink(path) or getattr(os.path, 'isjunction', lambda path: False)(path)
+
+def remove_link(path):
+	# Directory links on Windows go with rmdir, which doesn't touch the target
+	if os.name == 'nt' and os.path.isdir(path):
+		os.rmdir(path)
+	else:
+		os.unlink(path)
+
+def count_entries(path):
+	total = 0
+	with os.scandir(path) as entries:
+		for entry in entries:
+			total += 1
+			if not is_link(entry.path) and entry.is_dir(follow_symlinks=False):
+				total += count_entries(entry.path)
+	return total
+
+def remove_tree(path, progress, token=None):
+	# Bottom-up like shutil.rmtree, without descending into links. progress
+	# is [done, total] and is reported once per folder.
+	with os.scandir(path) as entries:
+		entries = list(entries)
+	for entry in entries:
+		if token is not None:
+			token.check()
+		if is_link(entry.path):
+			remove_link(entry.path)
+		elif entry.is_dir(follow_symlinks=False):
+			remove_tree(entry.path, progress, token)
+		else:
+			os.remove(entry.path)
+		progress[0] += 1
+	os.rmdir(path)
+	if token is not None:
+		token.report(*progress)
+
+def purge(trash_dirs, token=None):
+	# Removes everything in the given trash folders. Each entry is renamed
+	# first so an undo can't pick up a half deleted mod. Progress is
+	# reported as (entries removed, entries in total) through the token.
+	claimed = []
+	for trash in trash_dirs:
+		if not os.path.isdir(trash):
+			continue
+		for entry in os.listdir(trash):
+			path = os.path.join(trash, entry)
+			if not entry.endswith(purging_suffix):
+				try:
+					os.rename(path, path + purging_suffix)
+				except OSError as e:
+					tracer.warning(f"Failed to claim {path} for removal: {e}")
+					continue
+				path += purging_suffix
+			claimed.append(path)
+	# A trashed mod can itself be a link to a folder elsewhere, which is
+	# unlinked rather than emptied
+	total = sum(1 if is_link(path) or not os.path.isdir(path) else count_entries(path) + 1 for path in claimed)
+	progress = [0, total]
+	for path in claimed:
+		if is_link(path):
+			remove_link(path)
+		elif os.path.isdir(path):
+			remove_tree(path, progress, token)
+		else:
+			os.remove(path)
+		progress[0] += 1
+		if token is not None:
+			token.report(*progress)
+	for trash in trash_dirs:
+		try:
+			os.rmdir(trash)
+		except OSError:
+			# Not empty, something was trashed while we were busy
+			pass
+	return progress[0]
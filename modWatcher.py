@@ -0,0 +1,72 @@
+import os
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+class ModWatcher(QObject):
+	# Emitted once per batch: the directories that changed and whether the
+	# ModEngine2 config was touched
+	changed = pyqtSignal(set, bool)
+
+	def __init__(self, delay=250, parent=None):
+		super().__init__(parent)
+		self.watcher = QFileSystemWatcher(self)
+		self.watcher.directoryChanged.connect(self.on_directory_changed)
+		self.watcher.fileChanged.connect(self.on_file_changed)
+		# Editors and our own saves tend to fire several events in a row,
+		# so collect them and only report after things settle down
+		self.timer = QTimer(self)
+		self.timer.setSingleShot(True)
+		self.timer.setInterval(delay)
+		self.timer.timeout.connect(self.flush)
+		self.config_game_path = ''
+		self.root_mods_path = ''
+		self.pending_dirs = set()
+		self.config_changed = False
+
+	def watch(self, config_game_path, root_mods_path, mod_names=()):
+		self.clear()
+		self.config_game_path = config_game_path
+		self.root_mods_path = root_mods_path
+		if os.path.isfile(config_game_path):
+			self.watcher.addPath(config_game_path)
+		self.watch_mods(mod_names)
+
+	def watch_mods(self, mod_names):
+		# Watch the mod root and the top level of every mod folder
+		wanted = set()
+		if os.path.isdir(self.root_mods_path):
+			wanted.add(self.root_mods_path)
+		for name in mod_names:
+			mod_path = os.path.join(self.root_mods_path, name)
+			if os.path.isdir(mod_path):
+				wanted.add(mod_path)
+		watched = set(self.watcher.directories())
+		if watched - wanted:
+			self.watcher.removePaths(list(watched - wanted))
+		if wanted - watched:
+			self.watcher.addPaths(list(wanted - watched))
+
+	def clear(self):
+		paths = self.watcher.files() + self.watcher.directories()
+		if paths:
+			self.watcher.removePaths(paths)
+		self.timer.stop()
+		self.pending_dirs = set()
+		self.config_changed = False
+
+	def on_directory_changed(self, path):
+		self.pending_dirs.add(path)
+		self.timer.start()
+
+	def on_file_changed(self, path):
+		# A save that replaces the file drops it from the watch list
+		if path not in self.watcher.files() and os.path.isfile(path):
+			self.watcher.addPath(path)
+		self.config_changed = True
+		self.timer.start()
+
+	def flush(self):
+		dirs = self.pending_dirs
+		config_changed = self.config_changed
+		self.pending_dirs = set()
+		self.config_changed = False
+		self.changed.emit(dirs, config_changed)
@@ -0,0 +1,75 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QComboBox, QPushButton,
+							 QLabel, QFileDialog, QHeaderView, QAbstractItemView)
+from perfTrace import tracer, levels
+
+class PerformancePanel(QWidget):
+	# Recent span durations, newest first. Spans are recorded on any thread,
+	# the panel only reads the tracer's history while it is visible.
+	headers = ['Span', 'ms', 'Thread', 'Details']
+
+	def __init__(self, parent=None, rows=200, interval=1000):
+		super().__init__(parent)
+		self.rows = rows
+		# Newest entry on screen, a refresh without new spans does nothing
+		self.newest = None
+
+		self.level_box = QComboBox()
+		self.level_box.addItems(list(levels))
+		self.level_box.setCurrentText(tracer.level_name())
+		self.level_box.currentTextChanged.connect(tracer.set_level)
+		self.save_button = QPushButton('Save Trace…')
+		self.save_button.clicked.connect(self.save_trace)
+		controls = QHBoxLayout()
+		controls.addWidget(QLabel('Console level'))
+		controls.addWidget(self.level_box)
+		controls.addStretch()
+		controls.addWidget(self.save_button)
+
+		self.table = QTableWidget(0, len(self.headers))
+		self.table.setHorizontalHeaderLabels(self.headers)
+		self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+		self.table.verticalHeader().hide()
+		self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+
+		layout = QVBoxLayout()
+		layout.addLayout(controls)
+		layout.addWidget(self.table)
+		self.setLayout(layout)
+
+		self.timer = QTimer(self)
+		self.timer.setInterval(interval)
+		self.timer.timeout.connect(self.refresh)
+
+	def showEvent(self, event):
+		super().showEvent(event)
+		self.refresh()
+		self.timer.start()
+
+	def hideEvent(self, event):
+		super().hideEvent(event)
+		self.timer.stop()
+
+	def refresh(self):
+		spans = [entry for entry in tracer.snapshot() if 'ms' in entry][-self.rows:]
+		spans.reverse()
+		newest = spans[0] if spans else None
+		if newest is self.newest:
+			return
+		self.newest = newest
+		self.table.setRowCount(len(spans))
+		for row, entry in enumerate(spans):
+			details = ' '.join(f"{key}={value}" for key, value in entry.get('fields', {}).items())
+			if entry.get('error'):
+				details = f"{entry['error']} {details}".rstrip()
+			for column, text in enumerate((entry['name'], f"{entry['ms']:.1f}", entry['thread'], details)):
+				self.table.setItem(row, column, QTableWidgetItem(text))
+
+	def save_trace(self):
+		path, _ = QFileDialog.getSaveFileName(self, 'Save Trace', 'trace.jsonl', 'JSON Lines (*.jsonl)')
+		if not path:
+			return
+		try:
+			tracer.dump(path)
+		except OSError as e:
+			tracer.error(f"Failed to save the trace: {e}")
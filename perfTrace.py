@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import time
+import functools
+import threading
+import contextlib
+from collections import deque
+
+# Timing spans and log messages for the whole app, in place of loose
+# print() calls. Everything is kept in a short in-memory history for the
+# Performance panel; what reaches the console and the optional JSON-lines
+# file depends on the level:
+#   MEO_TRACE_LEVEL=debug   every span and message (default: info)
+#   MEO_TRACE_FILE=trace.jsonl
+
+levels = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
+
+class Tracer:
+	def __init__(self, level='info', export_path=None, keep=500, slow_ms=100):
+		self.lock = threading.Lock()
+		self.level = levels['info']
+		self.set_level(level)
+		# Spans slower than this are reported at info level instead of debug
+		self.slow_ms = slow_ms
+		# Newest last, read by the Performance panel
+		self.recent = deque(maxlen=keep)
+		self.export_file = None
+		# Exceptions that end a span without anything being wrong, e.g. a
+		# scan cancelled by a newer one
+		self.quiet_errors = ()
+		if export_path:
+			self.export(export_path)
+
+	def set_level(self, level):
+		self.level = levels.get(str(level).lower(), self.level)
+
+	def level_name(self):
+		return next(name for name, value in levels.items() if value == self.level)
+
+	def export(self, path):
+		# Appends every entry that passes the level to path, None stops it
+		with self.lock:
+			if self.export_file is not None:
+				self.export_file.close()
+				self.export_file = None
+			if path:
+				try:
+					self.export_file = open(path, 'a', encoding='utf-8')
+				except OSError as e:
+					self.console(f"Failed to open the trace file {path}: {e}")
+
+	def snapshot(self):
+		# Copy of the recent history, safe while other threads keep tracing
+		with self.lock:
+			return list(self.recent)
+
+	def dump(self, path):
+		# Writes the recent history as JSON lines, whatever the level
+		with open(path, 'w', encoding='utf-8') as dump_file:
+			for entry in self.snapshot():
+				dump_file.write(json.dumps(entry, default=str) + '\n')
+
+	def emit(self, entry):
+		with self.lock:
+			self.recent.append(entry)
+			if levels[entry['level']] < self.level:
+				return
+			if self.export_file is not None:
+				self.export_file.write(json.dumps(entry, default=str) + '\n')
+				self.export_file.flush()
+		fields = ' '.join(f"{key}={value}" for key, value in entry.get('fields', {}).items())
+		if 'ms' in entry:
+			line = f"{entry['name']} took {entry['ms']:.1f} ms {fields}".rstrip()
+		else:
+			line = f"{entry['name']} {fields}".rstrip()
+		if entry.get('error'):
+			line += f" ({entry['error']})"
+		self.console(f"[{entry['level']}] {line}")
+
+	def console(self, line):
+		# Windowed builds (console=False in app.spec) have no stderr at all
+		if sys.stderr is not None:
+			sys.stderr.write(line + '\n')
+
+	def log(self, level, message, **fields):
+		entry = {'time': time.time(), 'level': level, 'name': message, 'thread': threading.current_thread().name}
+		if fields:
+			entry['fields'] = fields
+		self.emit(entry)
+
+	def debug(self, message, **fields):
+		self.log('debug', message, **fields)
+
+	def info(self, message, **fields):
+		self.log('info', message, **fields)
+
+	def warning(self, message, **fields):
+		self.log('warning', message, **fields)
+
+	def error(self, message, **fields):
+		self.log('error', message, **fields)
+
+	@contextlib.contextmanager
+	def span(self, name, **fields):
+		# Times the block. fields is yielded so the block can add what it
+		# found out, e.g. how many files it scanned.
+		start = time.perf_counter()
+		error = None
+		try:
+			yield fields
+		except BaseException as e:
+			error = f"{type(e).__name__}: {e}".rstrip(': ')
+			if isinstance(e, self.quiet_errors):
+				fields['cancelled'] = True
+				error = None
+			raise
+		finally:
+			ms = (time.perf_counter() - start) * 1000
+			level = 'warning' if error else 'info' if ms >= self.slow_ms else 'debug'
+			entry = {'time': time.time(), 'level': level, 'name': name, 'ms': round(ms, 3),
+					 'thread': threading.current_thread().name, 'fields': fields}
+			if error:
+				entry['error'] = error
+			self.emit(entry)
+
+	def traced(self, name):
+		# Decorator form of span()
+		def decorate(fn):
+			@functools.wraps(fn)
+			def wrapper(*args, **kwargs):
+				with self.span(name):
+					return fn(*args, **kwargs)
+			return wrapper
+		return decorate
+
+# Shared by every module, app.py and meo.py
+tracer = Tracer(os.environ.get('MEO_TRACE_LEVEL', 'info'), os.environ.get('MEO_TRACE_FILE'))
@@ -0,0 +1,146 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from perfTrace import tracer
+
+class Cancelled(Exception):
+	pass
+
+tracer.quiet_errors += (Cancelled,)
+
+class CancelToken:
+	# Handed to every scan so a newer request can tell an older one to stop
+	def __init__(self):
+		self.cancelled = False
+		# Set by the task running the scan, see report()
+		self.reporter = None
+
+	def cancel(self):
+		self.cancelled = True
+
+	def check(self):
+		if self.cancelled:
+			raise Cancelled()
+
+	def report(self, done, total):
+		# Long jobs tell the GUI how far along they are
+		if self.reporter is not None:
+			self.reporter(done, total)
+
+class ScanSignals(QObject):
+	finished = pyqtSignal(object, object)
+	failed = pyqtSignal(object, str)
+	done = pyqtSignal(object)
+	progress = pyqtSignal(object, int, int)
+
+class ScanTask(QRunnable):
+	def __init__(self, fn, token):
+		super().__init__()
+		self.fn = fn
+		self.token = token
+		self.signals = ScanSignals()
+		token.reporter = lambda done, total: self.signals.progress.emit(token, done, total)
+
+	def run(self):
+		try:
+			result = self.fn(self.token)
+		except Cancelled:
+			pass
+		except Exception as e:
+			self.signals.failed.emit(self.token, str(e))
+		else:
+			self.signals.finished.emit(self.token, result)
+		self.signals.done.emit(self.token)
+
+class Scanner(QObject):
+	# Runs one kind of scan on the shared thread pool. Starting a new scan
+	# cancels the one still running, and only the latest result is reported.
+	started = pyqtSignal()
+	finished = pyqtSignal(object)
+	failed = pyqtSignal(str)
+	progress = pyqtSignal(int, int)
+
+	def __init__(self, parent=None):
+		super().__init__(parent)
+		self.token = None
+		# Tasks are kept alive here until the pool is done with them
+		self.tasks = {}
+
+	def start(self, fn):
+		# fn is called on a worker thread with the CancelToken as its only argument
+		if self.token is not None:
+			self.token.cancel()
+		self.token = CancelToken()
+		task = ScanTask(fn, self.token)
+		task.setAutoDelete(False)
+		task.signals.finished.connect(self.on_finished)
+		task.signals.failed.connect(self.on_failed)
+		task.signals.done.connect(self.on_done)
+		task.signals.progress.connect(self.on_progress)
+		self.tasks[self.token] = task
+		self.started.emit()
+		QThreadPool.globalInstance().start(task)
+		return self.token
+
+	def cancel(self):
+		# Drop the running scan, its result is never reported
+		if self.token is not None:
+			self.token.cancel()
+			self.token = None
+
+	def busy(self):
+		return self.token is not None
+
+	def on_finished(self, token, result):
+		if token is not self.token:
+			return
+		self.token = None
+		self.finished.emit(result)
+
+	def on_failed(self, token, error):
+		tracer.warning(f"Scan failed: {error}")
+		if token is self.token:
+			self.token = None
+			self.failed.emit(error)
+
+	def on_progress(self, token, done, total):
+		if token is self.token:
+			self.progress.emit(done, total)
+
+	def on_done(self, token):
+		self.tasks.pop(token, None)
+
+class Jobs(QObject):
+	# Runs one-off jobs like renames on the shared thread pool. Unlike
+	# Scanner nothing gets cancelled, every job reports back to its own
+	# callbacks on the GUI thread.
+	def __init__(self, parent=None):
+		super().__init__(parent)
+		# Key: token, Value: (task, done callback, failed callback)
+		self.tasks = {}
+
+	def run(self, fn, done=None, failed=None):
+		token = CancelToken()
+		task = ScanTask(fn, token)
+		task.setAutoDelete(False)
+		task.signals.finished.connect(self.on_finished)
+		task.signals.failed.connect(self.on_failed)
+		task.signals.done.connect(self.on_done)
+		self.tasks[token] = (task, done, failed)
+		QThreadPool.globalInstance().start(task)
+		return token
+
+	def busy(self):
+		return bool(self.tasks)
+
+	def on_finished(self, token, result):
+		callback = self.tasks[token][1]
+		if callback is not None:
+			callback(result)
+
+	def on_failed(self, token, error):
+		tracer.warning(f"Job failed: {error}")
+		callback = self.tasks[token][2]
+		if callback is not None:
+			callback(error)
+
+	def on_done(self, token):
+		self.tasks.pop(token, None)
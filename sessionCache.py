@@ -0,0 +1,17 @@
+from jsonFile import load_json, save_json
+
+# What the mod table showed when the app was last closed, per game. Startup
+# paints these rows right away and the first scan corrects them.
+cache_path = 'session_cache.json'
+
+def load_rows(game, config_game_path, path=cache_path):
+	# [(name, date modified, enabled, conflict state)] or None
+	entry = load_json(path, 'the session cache', {}).get(game)
+	if not entry or entry.get('config_game_path') != config_game_path:
+		return None
+	return [tuple(row) for row in entry.get('rows', [])]
+
+def save_rows(game, config_game_path, rows, path=cache_path):
+	cache = load_json(path, 'the session cache', {})
+	cache[game] = {'config_game_path': config_game_path, 'rows': [list(row) for row in rows]}
+	save_json(path, cache, 'the session cache')
@@ -0,0 +1,42 @@
+import time
+from jsonFile import save_json
+from perfTrace import tracer
+
+# app.py imports this module before anything else, so the clock starts
+# before PyQt6 and the rest of the app are loaded
+started = time.perf_counter()
+
+# Last startup's phases, kept next to config.toml
+timeline_path = 'startup_timeline.json'
+
+class StartupTimeline:
+	# Records when each startup phase finished, in ms since `start`
+	def __init__(self, start=started):
+		self.start = start
+		# [(phase, ms since start)]
+		self.phases = []
+		self.finished = False
+
+	def mark(self, phase):
+		if not self.finished:
+			self.phases.append((phase, (time.perf_counter() - self.start) * 1000))
+
+	def report(self):
+		# [{'phase', 'at_ms', 'took_ms'}], took_ms is the time since the previous phase
+		rows = []
+		previous = 0
+		for phase, at in self.phases:
+			rows.append({'phase': phase, 'at_ms': round(at, 1), 'took_ms': round(at - previous, 1)})
+			previous = at
+		return rows
+
+	def finish(self, path=timeline_path):
+		# Called once startup is over, later marks are ignored
+		if self.finished:
+			return
+		self.finished = True
+		rows = self.report()
+		tracer.info('Startup: ' + ', '.join(f"{row['phase']} {row['took_ms']:.0f} ms" for row in rows))
+		save_json(path, rows, 'the startup timeline', indent=1)
+
+startup_timeline = StartupTimeline()
@@ -0,0 +1,126 @@
+import re
+import toml
+
+# Rewrites a single array in a TOML document without touching the rest of
+# the text, so comments and layout ModEngine2 ships with survive a save.
+# Handles both `key = [...]` under its table and the [[table.key]] form
+# toml.dump writes. Anything else returns None and the caller falls back
+# to a full dump.
+
+bare_key = re.compile(r'^[A-Za-z0-9_-]+$')
+encoder = toml.TomlEncoder()
+
+def header_pattern(name, array=False):
+	parts = r'\s*\.\s*'.join(re.escape(part) for part in name.split('.'))
+	if array:
+		return re.compile(r'^[ \t]*\[\[\s*' + parts + r'\s*\]\][ \t]*(#.*)?$', re.MULTILINE)
+	return re.compile(r'^[ \t]*\[\s*' + parts + r'\s*\][ \t]*(#.*)?$', re.MULTILINE)
+
+# any table or array-of-tables header
+any_header = re.compile(r'^[ \t]*\[', re.MULTILINE)
+
+def section_end(text, start):
+	match = any_header.search(text, start)
+	return match.start() if match else len(text)
+
+def array_end(text, start):
+	# text[start] is the opening bracket, returns the index after the
+	# matching closing bracket while skipping strings and comments
+	depth = 0
+	i = start
+	length = len(text)
+	while i < length:
+		char = text[i]
+		if char == '#':
+			newline = text.find('\n', i)
+			i = length if newline == -1 else newline
+			continue
+		if char in '"\'':
+			quote = char * 3 if text.startswith(char * 3, i) else char
+			i += len(quote)
+			while i < length and not text.startswith(quote, i):
+				# only basic strings have escapes
+				i += 2 if char == '"' and text[i] == '\\' else 1
+			i += len(quote)
+			continue
+		if char in '[{':
+			depth += 1
+		elif char in ']}':
+			depth -= 1
+			if depth == 0:
+				return i + 1
+		i += 1
+	return None
+
+def format_key(key):
+	return key if bare_key.match(key) else encoder.dump_value(key)
+
+def format_value(value):
+	if isinstance(value, dict):
+		return '{ ' + ', '.join(f"{format_key(k)} = {format_value(v)}" for k, v in value.items()) + ' }'
+	if isinstance(value, list):
+		return '[' + ', '.join(format_value(v) for v in value) + ']'
+	return encoder.dump_value(value)
+
+def patch_inline_array(text, table, key, values):
+	header = header_pattern(table).search(text)
+	if header is None:
+		return None
+	end = section_end(text, header.end())
+	key_line = re.compile(r'^([ \t]*)' + re.escape(key) + r'[ \t]*=[ \t]*', re.MULTILINE)
+	match = key_line.search(text, header.end(), end)
+	if match is None or not text.startswith('[', match.end()):
+		return None
+	start = match.end()
+	stop = array_end(text, start)
+	if stop is None:
+		return None
+	old = text[start:stop]
+	if not values:
+		new = '[]' if '\n' not in old else '[\n]'
+	elif '\n' in old or any(isinstance(v, dict) for v in values):
+		# one element per line, indented like the old elements
+		indent = re.search(r'\n([ \t]*)\S', old)
+		indent = indent.group(1) if indent and indent.group(1) else match.group(1) + '    '
+		new = '[\n' + ''.join(f"{indent}{format_value(v)},\n" for v in values) + match.group(1) + ']'
+	else:
+		new = format_value(values)
+	return text[:start] + new + text[stop:]
+
+def patch_table_array(text, table, key, values):
+	name = table + '.' + key
+	headers = list(header_pattern(name, array=True).finditer(text))
+	# an empty list can't be written as blocks at all
+	if not headers or not values or not all(isinstance(v, dict) for v in values):
+		return None
+	start = headers[0].start()
+	# the run of [[table.key]] blocks ends at the first header that isn't one of them
+	block_starts = {match.start() for match in headers}
+	pos = start
+	while True:
+		newline = text.find('\n', pos)
+		if newline == -1:
+			stop = len(text)
+			break
+		stop = section_end(text, newline + 1)
+		if stop not in block_starts:
+			break
+		pos = stop
+	if stop != len(text) and any(match.start() > stop for match in headers):
+		# blocks split around other tables, leave that to a full dump
+		return None
+	blocks = []
+	for value in values:
+		lines = [f"[[{name}]]"] + [f"{format_key(k)} = {format_value(v)}" for k, v in value.items()]
+		blocks.append('\n'.join(lines) + '\n')
+	return text[:start] + '\n'.join(blocks) + ('\n' if stop != len(text) else '') + text[stop:]
+
+def patch_array(text, dotted_key, values):
+	# dotted_key like 'extension.mod_loader.mods'
+	table, _, key = dotted_key.rpartition('.')
+	if not table:
+		return None
+	patched = patch_inline_array(text, table, key, values)
+	if patched is None:
+		patched = patch_table_array(text, table, key, values)
+	return patched